@@ -1,9 +1,10 @@
 """HTTP server for Skroutz MCP Server with hot reloading support."""
 
+import asyncio
 import logging
 import os
 from contextlib import asynccontextmanager
-from typing import Optional
+from typing import Any, Callable, Optional
 
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
@@ -16,22 +17,82 @@ from .models import AuthCredentials
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger("skroutz-http-server")
 
+# Number of pooled clients, i.e. how many read-only calls can run at once
+# (SKROUTZ_MAX_CONCURRENCY overrides it)
+_POOL_SIZE = max(1, int(os.environ.get("SKROUTZ_MAX_CONCURRENCY", "3")))
+
 # Global state
 auth_manager: AuthManager
-skroutz_client: SkroutzClientCffi
+# Clients pick up the session cookies from auth_manager; each one has its own HTTP
+# session (all sharing one cookie jar) and is used by one call at a time
+skroutz_clients: list[SkroutzClientCffi] = []
+client_pool: asyncio.Queue[SkroutzClientCffi]
 credentials: Optional[AuthCredentials] = None
+# Serializes calls that change the cart or the session
+_write_lock = asyncio.Lock()
+
+
+def _init_client_pool(manager: AuthManager) -> None:
+    """
+    Create the pooled clients.
+
+    They share one cookie jar, so cookies refreshed by any call (a Cloudflare
+    clearance, a rotated session cookie, a login or logout) reach all of them.
+    """
+    global skroutz_clients, client_pool
+
+    skroutz_clients = [SkroutzClientCffi(manager) for _ in range(_POOL_SIZE)]
+    for client in skroutz_clients[1:]:
+        client._share_cookies_with(skroutz_clients[0])
+    client_pool = asyncio.Queue()
+    for client in skroutz_clients:
+        client_pool.put_nowait(client)
+
+
+async def _run_client(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a read-only client method on a pooled client in a worker thread.
+
+    Args:
+        func: SkroutzClientCffi method, called with the checked out client as self
+    """
+    client = await client_pool.get()
+    try:
+        return await asyncio.to_thread(func, client, *args, **kwargs)
+    finally:
+        client_pool.put_nowait(client)
+
+
+async def _run_client_exclusive(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a client method that changes the cart or the session, with no other call in flight.
+
+    Every pooled client is checked out for the duration of the call, and the ones
+    that did not run it drop their cached cart afterwards.
+    """
+    async with _write_lock:
+        clients: list[SkroutzClientCffi] = []
+        try:
+            for _ in range(_POOL_SIZE):
+                clients.append(await client_pool.get())
+            return await asyncio.to_thread(func, clients[0], *args, **kwargs)
+        finally:
+            for client in clients[1:]:
+                client._invalidate_cart_cache()
+            for client in clients:
+                client_pool.put_nowait(client)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup and shutdown."""
-    global auth_manager, skroutz_client, credentials
+    global auth_manager, credentials
 
     # Startup
     logger.info("Starting Skroutz HTTP Server...")
     auth_manager = AuthManager()
-    skroutz_client = SkroutzClientCffi(auth_manager)
-    logger.info("Using curl_cffi client for all operations")
+    _init_client_pool(auth_manager)
+    logger.info(f"Using a pool of {_POOL_SIZE} curl_cffi clients for all operations")
 
     # Load credentials from environment variables
     email = os.environ.get("SKROUTZ_EMAIL")
@@ -47,7 +108,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down Skroutz HTTP Server...")
-    skroutz_client.close()
+    for client in skroutz_clients:
+        client.close()
 
 
 app = FastAPI(
@@ -155,7 +217,7 @@ async def login(request: LoginRequest):
     """Login to skroutz.gr."""
     try:
         login_credentials = AuthCredentials(email=request.email, password=request.password)
-        success = skroutz_client.login(login_credentials)
+        success = await _run_client_exclusive(SkroutzClientCffi.login, login_credentials)
 
         if success:
             return LoginResponse(
@@ -172,7 +234,7 @@ async def login(request: LoginRequest):
 async def logout():
     """Logout from skroutz.gr."""
     try:
-        skroutz_client.logout()
+        await _run_client_exclusive(SkroutzClientCffi.logout)
         return {"success": True, "message": "Successfully logged out"}
     except Exception as e:
         logger.error(f"Logout error: {e}", exc_info=True)
@@ -193,7 +255,7 @@ async def auth_status():
 async def search_products(request: SearchRequest):
     """Search for products by name."""
     try:
-        products = skroutz_client.search_products(query=request.query)
+        products = await _run_client(SkroutzClientCffi.search_products, query=request.query)
 
         return {
             "count": len(products),
@@ -212,7 +274,7 @@ async def get_cart():
         if not auth_manager.is_authenticated():
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        cart = skroutz_client.get_cart()
+        cart = await _run_client(SkroutzClientCffi.get_cart)
         return cart.model_dump()
     except HTTPException:
         raise
@@ -232,7 +294,9 @@ async def add_to_cart(request: AddToCartRequest):
 
         # Get product details and add to cart
         logger.info(f"Adding to cart: {product_url_or_id}")
-        details = skroutz_client.get_product_details_for_cart(product_url_or_id)
+        details = await _run_client(
+            SkroutzClientCffi.get_product_details_for_cart, product_url_or_id
+        )
 
         if not details or not details.get('product_id'):
             return {
@@ -240,7 +304,8 @@ async def add_to_cart(request: AddToCartRequest):
                 "message": "Could not extract product details. Product may not support 'Αγορά μέσω Skroutz'.",
             }
 
-        success = skroutz_client.add_to_cart(
+        success = await _run_client_exclusive(
+            SkroutzClientCffi.add_to_cart,
             sku_id=details.get('sku_id', product_url_or_id),
             product_id=details['product_id'],
             shop_id=details['shop_id'],
@@ -272,7 +337,9 @@ async def remove_from_cart(request: RemoveFromCartRequest):
         if not auth_manager.is_authenticated():
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        success = skroutz_client.remove_from_cart(request.product_id)
+        success = await _run_client_exclusive(
+            SkroutzClientCffi.remove_from_cart, request.product_id
+        )
 
         if success:
             return {"success": True, "message": f"Removed product {request.product_id} from cart"}
@@ -292,7 +359,9 @@ async def update_cart(request: UpdateCartRequest):
         if not auth_manager.is_authenticated():
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        success = skroutz_client.update_cart_item_quantity(request.product_id, request.quantity)
+        success = await _run_client_exclusive(
+            SkroutzClientCffi.update_cart_item_quantity, request.product_id, request.quantity
+        )
 
         if success:
             return {
@@ -319,7 +388,9 @@ async def get_orders(request: OrdersRequest):
         if not auth_manager.is_authenticated():
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        orders = skroutz_client.get_orders(include_history=request.include_history)
+        orders = await _run_client(
+            SkroutzClientCffi.get_orders, include_history=request.include_history
+        )
 
         return {
             "count": len(orders),
@@ -339,7 +410,7 @@ async def get_order_details(order_id: str):
         if not auth_manager.is_authenticated():
             raise HTTPException(status_code=401, detail="Not authenticated")
 
-        order = skroutz_client.get_order_details(order_id)
+        order = await _run_client(SkroutzClientCffi.get_order_details, order_id)
 
         if not order:
             raise HTTPException(status_code=404, detail=f"Order {order_id} not found")
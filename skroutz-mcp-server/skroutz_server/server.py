@@ -7,11 +7,11 @@ from typing import Any, Optional
 
 from mcp.server import Server
 from mcp.types import Resource, Tool, TextContent
-from pydantic import AnyUrl
+from pydantic import AnyUrl, TypeAdapter
 
 from .auth import AuthManager
 from .skroutz_client_cffi import SkroutzClientCffi
-from .models import AuthCredentials
+from .models import AuthCredentials, Order
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -25,6 +25,9 @@ auth_manager: AuthManager
 skroutz_client: SkroutzClientCffi
 credentials: Optional[AuthCredentials] = None
 
+# Serializes the orders resource in pydantic-core, like the cart's model_dump_json
+_ORDERS_ADAPTER = TypeAdapter(list[Order])
+
 
 async def ensure_authenticated() -> bool:
     """Ensure the client is authenticated, auto-login if credentials are available."""
@@ -91,10 +94,7 @@ async def read_resource(uri: AnyUrl) -> str:
             return "Error: Not authenticated. Please login first."
 
         orders = skroutz_client.get_orders()
-        result = [order.model_dump() for order in orders]
-        import json
-
-        return json.dumps(result, indent=2, default=str)
+        return _ORDERS_ADAPTER.dump_json(orders, indent=2).decode()
 
     raise ValueError(f"Unknown resource: {uri}")
 
@@ -1,22 +1,310 @@
 """Skroutz.gr client using curl_cffi for Cloudflare bypass."""
 
+import itertools
 import logging
 import re
-from decimal import Decimal
-from typing import Any, Optional
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional
 from datetime import datetime
 
 from curl_cffi import requests
+from lxml import etree
 from .auth import AuthManager
 from .models import AuthCredentials, Cart, CartItem, Order, OrderItem, Product
 
 logger = logging.getLogger(__name__)
 
+# Shared lxml parser for UTF-8 encoded HTML (lxml serializes concurrent use of a parser)
+_HTML_PARSER = etree.HTMLParser(encoding='utf-8')
+
+# Cloudflare challenge markers always appear near the top of the page, so only
+# a prefix of the raw body needs to be scanned.
+_CF_CHALLENGE_RE = re.compile(
+    rb'checking your browser|challenge-running|cf-browser-verification|<title>just a moment', re.I
+)
+# Cloudflare block pages (e.g. error 1020, "Attention Required!") served with a 403
+_CF_BLOCK_RE = re.compile(rb'cf-error-details|cloudflare', re.I)
+_CF_SCAN_BYTES = 8192
+
+# CSRF token formats in priority order: meta tag, Rails form input, generic input
+_CSRF_TOKEN_RE = re.compile(
+    r'<meta\s+name=["\']csrf-token["\']\s+content=["\']([^"\']+)["\']'
+    r'|name=["\']authenticity_token["\'] value=["\']([^"\']+)["\']'
+    r'|(?i:name=["\']csrf[_-]token["\'] value=["\']([^"\']+)["\'])'
+)
+
+# Sponsored/promoted product markers (based on uBlock filters)
+_AD_CLASSES = frozenset({'labeled-product', 'labeled-item', 'product-ad'})
+_AD_PARENT_CLASSES = frozenset({'selected-product-cards', 'product-ad'})
+
+# Empty container of the React cart page; its items are then only in JavaScript
+_REACT_CART_EMPTY_RE = re.compile(
+    r"""<div\b[^>]*\sid\s*=\s*["']?react-cart-page["']?(?=[\s/>])[^>]*>\s*</div>""", re.I
+)
+_CART_ITEMS_COUNT_RE = re.compile(r'cart_items_count\s*=\s*(\d+)')
+
+# Cart rows: <li> elements holding a cart item link, or a product link inside the cart
+# or mini-cart container so that recommendation lists and breadcrumbs are skipped.
+# A row wrapping another matching row is left to the inner one.
+_CART_ROW_TEST = (
+    ".//a[contains(concat(' ', normalize-space(@class), ' '), ' suborder-item-details ')]"
+    " or (.//a[contains(@href, '/s/')] and ancestor::*[contains(@id, 'cart')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' cart ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' mini-cart ')])"
+)
+_CART_ITEMS_XPATH = etree.XPath(f"//li[({_CART_ROW_TEST}) and not(.//li[{_CART_ROW_TEST}])]")
+
+# Text nodes of an order container that mention a euro amount
+_EURO_TEXTS_XPATH = etree.XPath(".//text()[contains(., '€')]", smart_strings=False)
+
+# Order details item containers and their quantity/price spans
+_ORDER_ITEMS_XPATH = etree.XPath(
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' suborder-item ')]"
+)
+_ORDER_ITEM_NUMERIC_SPANS_XPATH = etree.XPath(
+    "(.//p[contains(concat(' ', normalize-space(@class), ' '), ' suborder-item-numeric ')])[1]//span"
+)
+
+# Out-of-stock markers used in product card classes / data-availability
+_UNAVAILABLE_MARKERS = frozenset({'out-of-stock', 'unavailable', 'exhausted'})
+
+# Out-of-stock phrases shown on product cards (Greek and English)
+_UNAVAILABLE_RE = re.compile(r'εξαντλημένο|out of stock|μη διαθέσιμο', re.I)
+
+# Patterns used inside the per-product/item/order parsing loops
+_ORDER_ID_RE = re.compile(r'\d+-(\d+)')
+_PRODUCT_HREF_RE = re.compile(r'/s/\d+/')
+_SKU_ID_RE = re.compile(r'/s/(\d+)/')
+_EURO_RE = re.compile(r'([\d.,]+)\s*€')
+_PRICE_RE = re.compile(r'([\d.,]+)')
+_TOTAL_NUM_RE = re.compile(r'(\d+[.,]\d+)')
+# Fallback cart row class, matched against one class token at a time
+_CART_ITEM_CLASS_RE = re.compile(r'cart.*item|line.*item', re.I)
+
+
+# Greek number format to Decimal format: drop thousands dots, comma becomes the point
+_PRICE_TRANS = str.maketrans({'.': '', ',': '.'})
+
+
+@lru_cache(maxsize=4096)
+def _to_decimal(amount: str) -> Decimal:
+    """Convert a normalized amount string to Decimal, caching repeated prices."""
+    return Decimal(amount)
+
+
+def _euro_to_cents(amount: str) -> Optional[int]:
+    """Convert a Greek-formatted euro amount (e.g. "1.136,25") to integer cents."""
+    euros, _, cents = amount.replace('.', '').partition(',')
+    if not (euros or cents) or len(cents) > 2:
+        return None
+    # An empty integer part (",99") is zero euros
+    if (euros and not euros.isdigit()) or (cents and not cents.isdigit()):
+        return None
+    return int(euros or '0') * 100 + int(cents.ljust(2, '0'))
+
+
+def _cents_to_decimal(cents: int) -> Decimal:
+    """Convert integer cents back to a two-decimal euro amount."""
+    return Decimal(cents).scaleb(-2)
+
+
+def _best_total_from_texts(texts: Iterable[str]) -> Optional[Decimal]:
+    """
+    Find the largest euro amount in the given texts.
+
+    Amounts are compared as integer cents and only the winner is converted to Decimal.
+
+    Args:
+        texts: Text snippets to scan for "<amount> €" patterns
+
+    Returns:
+        Largest positive amount found, or None if there is none
+    """
+    best_cents = 0
+    best_amount = None
+    for text in texts:
+        for amount in _EURO_RE.findall(text):
+            cents = _euro_to_cents(amount)
+            if cents is not None and cents > best_cents:
+                best_cents, best_amount = cents, amount
+    if best_amount is None:
+        return None
+    return _to_decimal(best_amount.translate(_PRICE_TRANS))
+
+
+def _extract_total(
+    order_container: etree._Element, total_elem: Optional[etree._Element]
+) -> Optional[Decimal]:
+    """
+    Extract an order total, trying the class-matched total element first.
+
+    Args:
+        order_container: Element holding the order
+        total_elem: Element whose class marks it as the total, if any
+
+    Returns:
+        Order total, or None if no amount was found
+    """
+    if total_elem is not None:
+        amount_match = _PRICE_RE.search(_element_text(total_elem))
+        if amount_match and _euro_to_cents(amount_match.group(1)) is not None:
+            return _to_decimal(amount_match.group(1).translate(_PRICE_TRANS))
+
+    # Fall back to the € amounts in the container; the largest one is usually the total
+    return _best_total_from_texts(_EURO_TEXTS_XPATH(order_container))
+
+
+def _build_order(order_data: dict) -> Optional[Order]:
+    """
+    Build an Order from one entry of a JSON orders list.
+
+    Args:
+        order_data: Order object from the orders JSON
+
+    Returns:
+        Order, or None if the entry could not be parsed
+    """
+    get = order_data.get
+    try:
+        # Only build the fallback values when the keys are actually missing
+        order_id = order_data['id'] if 'id' in order_data else get('order_id', '')
+        order_number = order_data['code'] if 'code' in order_data else get('order_number', '')
+        # Fields of an unexpected type fall back to their defaults
+        status = get('status')
+        created_at = get('created_at')
+        total = order_data['total'] if 'total' in order_data else get('amount', 0)
+        return Order(
+            id=str(order_id),
+            order_number=str(order_number),
+            status=status if isinstance(status, str) else 'unknown',
+            created_at=datetime.fromisoformat(created_at) if isinstance(created_at, str) else datetime.now(),
+            total=Decimal(str(total)),
+        )
+    except Exception as e:
+        logger.warning("Failed to parse order from JSON: %s", e)
+        return None
+
+
+def _element_text(elem: etree._Element) -> str:
+    """Return the stripped text of an lxml element (like BeautifulSoup's get_text(strip=True))."""
+    if len(elem) == 0:
+        # Plain text element (the common case for links): no subtree to walk
+        return (elem.text or '').strip()
+    return ''.join(text.strip() for text in elem.itertext())
+
+
+def _has_class(elem: etree._Element, name: str) -> bool:
+    """Check whether an lxml element has the given class token."""
+    return name in elem.get('class', '').split()
+
+
+def _class_contains(*keywords: str) -> Callable[[Optional[str]], bool]:
+    """
+    Build a case-insensitive class matcher for the given keywords.
+
+    The matcher is called with an element's whole class attribute (or None for
+    elements without a class) by ``_find_by_class``.
+    """
+    def match(value: Optional[str]) -> bool:
+        if not value:
+            return False
+        value = value.lower()
+        return any(keyword in value for keyword in keywords)
+
+    return match
+
+
+_PRICE_CLASS = _class_contains('price')
+_TOTAL_CLASS = _class_contains('total')
+
+
+def _find_by_class(
+    root: etree._Element, tags: tuple[str, ...], matcher: Callable[[Optional[str]], bool]
+) -> Optional[etree._Element]:
+    """Find the first descendant with one of the given tags whose class is accepted by matcher."""
+    for elem in root.iterdescendants(*tags):
+        if matcher(elem.get('class')):
+            return elem
+    return None
+
+
+def _class_xpath(tags: tuple[str, ...], keywords: tuple[str, ...]) -> etree.XPath:
+    """
+    Compile an XPath selecting the first descendant with one of the given tags whose
+    class contains one of the keywords (case-insensitive), so matching runs in libxml2.
+    """
+    lowered_class = "translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    tag_test = ' or '.join(f'self::{tag}' for tag in tags)
+    class_test = ' or '.join(f"contains({lowered_class}, '{keyword}')" for keyword in keywords)
+    return etree.XPath(f"(.//*[{tag_test}][{class_test}])[1]")
+
+
+def _first(elements: list[etree._Element]) -> Optional[etree._Element]:
+    """Return the first element of an XPath result, or None."""
+    return elements[0] if elements else None
+
+
+# Search result cards, and the generic product containers used when there are none
+_SKU_CARDS_XPATH = etree.XPath('//li[@data-skuid]')
+_PRODUCT_CARDS_XPATH = etree.XPath(
+    "//*[self::li or self::div][contains(translate(@class, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', "
+    "'abcdefghijklmnopqrstuvwxyz'), 'product') or contains(translate(@class, "
+    "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'item')]"
+)
+
+# Classed elements of an order container that may hold its status, date or total
+_ORDER_FIELD_CANDIDATES_XPATH = etree.XPath(
+    ".//*[self::span or self::div or self::p or self::time or self::strong][@class]"
+)
+
+# Status/total elements of an order details page
+_DETAILS_STATUS_XPATH = _class_xpath(('span', 'div'), ('status',))
+_DETAILS_TOTAL_XPATH = _class_xpath(('span', 'div'), ('total',))
+
+# Offer elements of a product page, in lookup priority order. Each lookup only
+# materializes the first match instead of wrapping the whole page in Python objects.
+_OFFER_TAGS = ('div', 'li', 'article', 'a', 'button')
+_OFFER_XPATHS = [
+    (f'[{attr}]', etree.XPath(
+        f"(.//*[{' or '.join(f'self::{tag}' for tag in _OFFER_TAGS)}][@{attr}])[1]"
+    ))
+    for attr in ('data-product-id', 'data-productid', 'data-product', 'data-offer-id', 'data-shop-id')
+] + [
+    (f'.{keyword}', _class_xpath(_OFFER_TAGS, (keyword,)))
+    for keyword in ('product-offer', 'offer-item', 'sku-offer')
+]
+
+
+def _tee_to_file(chunks: Iterable[bytes], path: str) -> Iterator[bytes]:
+    """Pass chunks through while also writing them to a file for debugging."""
+    try:
+        f = open(path, 'wb')
+    except OSError as e:
+        logger.warning(f"Could not open {path} for writing: {e}")
+        yield from chunks
+        return
+    with f:
+        for chunk in chunks:
+            f.write(chunk)
+            yield chunk
+    logger.info(f"Saved HTML to {path}")
+
 
 class SkroutzClientCffi:
     """Client for interacting with skroutz.gr using curl_cffi for CF bypass."""
 
     BASE_URL = "https://www.skroutz.gr"
+    # Seconds a fetched cart is reused for back-to-back get_cart calls
+    CART_CACHE_TTL = 2.0
+    # Seconds search results are reused for a repeated query, and how many queries are kept
+    SEARCH_CACHE_TTL = 60.0
+    SEARCH_CACHE_SIZE = 128
+    # Concurrent requests used by get_order_details_batch
+    ORDER_DETAILS_WORKERS = 8
 
     def __init__(self, auth_manager: AuthManager) -> None:
         """
@@ -26,6 +314,9 @@ class SkroutzClientCffi:
             auth_manager: Authentication manager instance
         """
         self.auth_manager = auth_manager
+        self._cart_cache: Optional[tuple[float, Cart]] = None
+        # Recent search results by query, least recently used first
+        self._search_cache: OrderedDict[str, tuple[float, tuple[Product, ...]]] = OrderedDict()
         # Create a session that impersonates Chrome browser
         self.session = requests.Session(impersonate="chrome120")
 
@@ -55,6 +346,11 @@ class SkroutzClientCffi:
         for name, value in cookies.items():
             self.session.cookies.set(name, value, domain=".skroutz.gr")
 
+    def _share_cookies_with(self, other: "SkroutzClientCffi") -> None:
+        """Use another client's cookie jar, so cookies set through either reach both."""
+        # A plain CookieJar is adopted as is rather than copied
+        self.session.cookies = other.session.cookies.jar
+
     def _save_cookies(self) -> None:
         """Save current cookies to auth manager."""
         cookies = {}
@@ -66,6 +362,15 @@ class SkroutzClientCffi:
                 cookies=cookies, user_email=self.auth_manager.session.user_email
             )
 
+    def _cache_cart(self, cart: Cart) -> Cart:
+        """Remember a freshly fetched cart for CART_CACHE_TTL seconds."""
+        self._cart_cache = (time.monotonic(), cart)
+        return cart
+
+    def _invalidate_cart_cache(self) -> None:
+        """Drop the cached cart after any operation that may modify it."""
+        self._cart_cache = None
+
     def login(self, credentials: AuthCredentials) -> bool:
         """
         Authenticate with skroutz.gr using curl_cffi.
@@ -77,6 +382,7 @@ class SkroutzClientCffi:
             True if login successful, False otherwise
         """
         logger.info(f"=== LOGIN (curl_cffi): email={credentials.email} ===")
+        self._invalidate_cart_cache()
 
         try:
             # Step 1: Get the login page to retrieve CSRF token
@@ -194,6 +500,7 @@ class SkroutzClientCffi:
 
     def logout(self) -> None:
         """Logout from skroutz.gr and clear session."""
+        self._invalidate_cart_cache()
         if self.auth_manager.is_authenticated():
             self._update_cookies()
             try:
@@ -217,6 +524,12 @@ class SkroutzClientCffi:
         """
         logger.info(f"=== SEARCH (curl_cffi): query='{query}' ===")
 
+        cached = self._search_cache.get(query)
+        if cached and time.monotonic() - cached[0] < self.SEARCH_CACHE_TTL:
+            self._search_cache.move_to_end(query)
+            logger.info("Returning cached search results")
+            return list(cached[1])
+
         try:
             self._update_cookies()
 
@@ -230,6 +543,13 @@ class SkroutzClientCffi:
             products = self._parse_products_from_html(search_response.text)
             logger.info(f"Found {len(products)} products")
 
+            # Empty results may come from a blocked page, so only cache hits
+            if products:
+                self._search_cache[query] = (time.monotonic(), tuple(products))
+                self._search_cache.move_to_end(query)
+                if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                    self._search_cache.popitem(last=False)
+
             return products
 
         except Exception as e:
@@ -258,7 +578,7 @@ class SkroutzClientCffi:
                 params = urlparse.parse_qs(parsed.query)
 
                 # Extract SKU ID from URL path
-                sku_match = re.search(r'/s/(\d+)/', sku_id_or_url)
+                sku_match = _SKU_ID_RE.search(sku_id_or_url)
                 sku_id = sku_match.group(1) if sku_match else ''
 
                 if 'product_id' in params:
@@ -328,7 +648,7 @@ class SkroutzClientCffi:
                     logger.info("✓ Found Hypernova JSON data")
 
                     # Extract SKU ID from URL
-                    sku_match = re.search(r'/s/(\d+)/', url)
+                    sku_match = _SKU_ID_RE.search(url)
                     sku_id = sku_match.group(1) if sku_match else sku_id_or_url
 
                     # The offerings are in data['offerings']
@@ -364,7 +684,7 @@ class SkroutzClientCffi:
                         logger.info(f"✓ Found JSON data with pattern: {pattern[:50]}...")
 
                         # Extract SKU ID from URL if available
-                        sku_match = re.search(r'/s/(\d+)/', url)
+                        sku_match = _SKU_ID_RE.search(url)
                         sku_id = sku_match.group(1) if sku_match else sku_id_or_url
 
                         # Try different data structure paths
@@ -442,30 +762,18 @@ class SkroutzClientCffi:
                         continue
 
             # Fallback: Try to extract from HTML
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(html, 'lxml')
+            root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
 
             logger.info("Falling back to HTML parsing...")
 
             # Extract SKU ID from URL
-            sku_match = re.search(r'/s/(\d+)/', url)
+            sku_match = _SKU_ID_RE.search(url)
             sku_id = sku_match.group(1) if sku_match else sku_id_or_url
 
             # Try multiple selectors for product offers
-            offer_selectors = [
-                {'attrs': {'data-product-id': True}},
-                {'attrs': {'data-productid': True}},
-                {'attrs': {'data-product': True}},
-                {'attrs': {'data-offer-id': True}},
-                {'attrs': {'data-shop-id': True}},
-                {'class': re.compile(r'product-offer', re.I)},
-                {'class': re.compile(r'offer-item', re.I)},
-                {'class': re.compile(r'sku-offer', re.I)},
-            ]
-
-            for selector in offer_selectors:
-                offer_elem = soup.find(['div', 'li', 'article', 'a', 'button'], **selector)
-                if offer_elem:
+            for selector, offer_xpath in _OFFER_XPATHS:
+                offer_elem = _first(offer_xpath(root)) if root is not None else None
+                if offer_elem is not None:
                     logger.info(f"Found potential offer element with selector: {selector}")
 
                     # Try all possible data attribute names
@@ -502,13 +810,14 @@ class SkroutzClientCffi:
 
                     # Strategy 2: find price element
                     if price == 0.0:
-                        price_elem = offer_elem.find(['span', 'div', 'a', 'strong'],
-                                                    class_=re.compile(r'price', re.I))
-                        if price_elem:
-                            price_text = price_elem.get_text(strip=True)
-                            price_match = re.search(r'([\d.,]+)\s*€', price_text)
+                        price_elem = _find_by_class(
+                            offer_elem, ('span', 'div', 'a', 'strong'), _PRICE_CLASS
+                        )
+                        if price_elem is not None:
+                            price_text = _element_text(price_elem)
+                            price_match = _EURO_RE.search(price_text)
                             if price_match:
-                                price_str = price_match.group(1).replace('.', '').replace(',', '.')
+                                price_str = price_match.group(1).translate(_PRICE_TRANS)
                                 try:
                                     price = float(price_str)
                                 except:
@@ -516,10 +825,10 @@ class SkroutzClientCffi:
 
                     # Strategy 3: search in all text content
                     if price == 0.0:
-                        all_text = offer_elem.get_text()
-                        price_match = re.search(r'([\d.,]+)\s*€', all_text)
+                        all_text = ''.join(offer_elem.itertext())
+                        price_match = _EURO_RE.search(all_text)
                         if price_match:
-                            price_str = price_match.group(1).replace('.', '').replace(',', '.')
+                            price_str = price_match.group(1).translate(_PRICE_TRANS)
                             try:
                                 price = float(price_str)
                             except:
@@ -570,6 +879,7 @@ class SkroutzClientCffi:
             raise Exception("Must be authenticated to modify cart")
 
         self._update_cookies()
+        self._invalidate_cart_cache()
 
         try:
             # Get CSRF token
@@ -643,6 +953,7 @@ class SkroutzClientCffi:
             raise Exception("Must be authenticated to modify cart")
 
         self._update_cookies()
+        self._invalidate_cart_cache()
 
         try:
             # Use the correct Skroutz endpoint
@@ -695,6 +1006,7 @@ class SkroutzClientCffi:
             raise Exception("Must be authenticated to modify cart")
 
         self._update_cookies()
+        self._invalidate_cart_cache()
 
         try:
             csrf_token = self._get_current_csrf_token()
@@ -750,6 +1062,11 @@ class SkroutzClientCffi:
             logger.error("GET CART FAILED: Not authenticated")
             raise Exception("Must be authenticated to view cart")
 
+        cached = self._cart_cache
+        if cached and time.monotonic() - cached[0] < self.CART_CACHE_TTL:
+            logger.info("Returning cached cart")
+            return cached[1]
+
         self._update_cookies()
 
         try:
@@ -779,7 +1096,7 @@ class SkroutzClientCffi:
 
                     # If we got items, return immediately
                     if cart.items or cart.item_count > 0:
-                        return cart
+                        return self._cache_cart(cart)
             except Exception as json_e:
                 logger.warning(f"JSON API /cart.json failed: {json_e}")
 
@@ -805,7 +1122,6 @@ class SkroutzClientCffi:
             logger.info(f"Initial cart visit: status={visit_response.status_code}")
 
             # Small delay to appear human
-            import time
             time.sleep(0.5)
 
             # Now try mini_cart as AJAX request (should have the items with HTML)
@@ -829,7 +1145,7 @@ class SkroutzClientCffi:
 
             if mini_response.status_code == 200:
                 # Check if it's not blocked
-                if 'cloudflare' in mini_response.text.lower() and 'challenge' in mini_response.text.lower():
+                if self._is_cloudflare_challenge(mini_response.content):
                     logger.warning("mini_cart blocked by Cloudflare")
                 else:
                     logger.info("✓ Got mini_cart data")
@@ -838,7 +1154,7 @@ class SkroutzClientCffi:
 
                     # If we got items, return them
                     if cart.items or cart.item_count > 0:
-                        return cart
+                        return self._cache_cart(cart)
 
             # Strategy 3: Direct full cart attempt
             logger.info(f"Fetching cart from {self.BASE_URL}/cart")
@@ -847,7 +1163,10 @@ class SkroutzClientCffi:
 
             # Check for Cloudflare before raising for status
             if response.status_code == 403:
-                if 'cloudflare' in response.text.lower():
+                if (
+                    self._is_cloudflare_challenge(response.content)
+                    or _CF_BLOCK_RE.search(response.content, 0, _CF_SCAN_BYTES)
+                ):
                     logger.error("⚠️  403 Forbidden - Cloudflare is blocking the request")
                     raise Exception("Cloudflare blocked the cart request (403 Forbidden)")
                 else:
@@ -859,7 +1178,7 @@ class SkroutzClientCffi:
             cart = self._parse_cart_from_html(response.text)
             logger.info(f"✓ Cart parsed: item_count={cart.item_count}, total={cart.total}")
 
-            return cart
+            return self._cache_cart(cart)
 
         except Exception as e:
             logger.error(f"Get cart error: {e}", exc_info=True)
@@ -940,31 +1259,40 @@ class SkroutzClientCffi:
                 "Sec-Fetch-Site": "same-origin",
             }
 
+            # Stream the page so long order histories are parsed while downloading
             response = self.session.get(
                 f"{self.BASE_URL}/account/orders",
                 timeout=30,
-                headers=ajax_headers
+                headers=ajax_headers,
+                stream=True,
             )
             logger.info(f"Orders page response: status={response.status_code}")
 
-            if response.status_code != 200:
-                logger.error(f"Failed to fetch orders: status={response.status_code}")
-                return []
-
-            # Check for Cloudflare
-            if 'checking your browser' in response.text.lower() or 'challenge-running' in response.text.lower():
-                logger.error("⚠️ Cloudflare blocked orders page")
-                raise Exception("Cloudflare blocked the orders request. Try again in a few moments or the data may require browser-based access.")
-
-            # Save for debugging
             try:
-                with open('/tmp/skroutz_orders.html', 'w', encoding='utf-8') as f:
-                    f.write(response.text)
-                logger.info("Saved orders HTML to /tmp/skroutz_orders.html")
-            except:
-                pass
+                if response.status_code != 200:
+                    logger.error(f"Failed to fetch orders: status={response.status_code}")
+                    return []
+
+                # Buffer just enough of the body to check for Cloudflare
+                chunks = response.iter_content()
+                head = b""
+                for chunk in chunks:
+                    head += chunk
+                    if len(head) >= _CF_SCAN_BYTES:
+                        break
+
+                if self._is_cloudflare_challenge(head):
+                    logger.error("⚠️ Cloudflare blocked orders page")
+                    raise Exception("Cloudflare blocked the orders request. Try again in a few moments or the data may require browser-based access.")
+
+                # Save for debugging while parsing
+                orders = self._parse_orders_from_stream(
+                    _tee_to_file(itertools.chain([head], chunks), '/tmp/skroutz_orders.html'),
+                    encoding=response.encoding,
+                )
+            finally:
+                response.close()
 
-            orders = self._parse_orders_from_html(response.text)
             logger.info(f"Found {len(orders)} orders from HTML")
 
             if not include_history:
@@ -1000,6 +1328,82 @@ class SkroutzClientCffi:
 
         self._update_cookies()
 
+        return self._fetch_order_details(order_id)
+
+    def get_order_details_batch(self, order_ids: list[str]) -> dict[str, Optional[Order]]:
+        """
+        Get detailed information for several orders concurrently.
+
+        Args:
+            order_ids: Order IDs to fetch details for
+
+        Returns:
+            Dictionary mapping each order ID to its Order, or None if not found
+        """
+        logger.info(f"=== GET ORDER DETAILS BATCH (curl_cffi): {len(order_ids)} orders ===")
+
+        if not self.auth_manager.is_authenticated():
+            raise Exception("Must be authenticated to view orders")
+
+        self._update_cookies()
+
+        # curl_cffi sessions use a curl handle per thread, so requests run in parallel
+        with ThreadPoolExecutor(max_workers=self.ORDER_DETAILS_WORKERS) as executor:
+            pages = list(executor.map(self._fetch_order_details_html, order_ids))
+
+        fetched = [(html, order_id) for html, order_id in zip(pages, order_ids) if html is not None]
+        orders: dict[str, Optional[Order]] = dict.fromkeys(order_ids)
+        for (_, order_id), order in zip(fetched, self._parse_order_details_batch(fetched)):
+            orders[order_id] = order
+        return orders
+
+    def get_orders_with_details(self, include_history: bool = True) -> list[Order]:
+        """
+        Get orders together with their items.
+
+        Order details pages are fetched concurrently and parsed in one batch.
+
+        Args:
+            include_history: Include past orders
+
+        Returns:
+            List of orders; items are filled in where the details page was available
+        """
+        orders = self.get_orders(include_history=include_history)
+        if not orders:
+            return orders
+
+        details = self.get_order_details_batch([order.id for order in orders])
+        return [
+            order.model_copy(update={'items': details[order.id].items}) if details.get(order.id) else order
+            for order in orders
+        ]
+
+    def _fetch_order_details(self, order_id: str) -> Optional[Order]:
+        """
+        Fetch and parse a single order details page.
+
+        Args:
+            order_id: Order ID to fetch details for
+
+        Returns:
+            Order object with items, or None if order not found
+        """
+        html = self._fetch_order_details_html(order_id)
+        if html is None:
+            return None
+        return self._parse_order_details_batch([(html, order_id)])[0]
+
+    def _fetch_order_details_html(self, order_id: str) -> Optional[str]:
+        """
+        Fetch the HTML of an order details page.
+
+        Args:
+            order_id: Order ID to fetch details for
+
+        Returns:
+            Page HTML, or None if the order was not found or the request failed
+        """
         try:
             # Use AJAX headers to bypass Cloudflare
             ajax_headers = {
@@ -1024,16 +1428,13 @@ class SkroutzClientCffi:
                 return None
 
             # Check for Cloudflare
-            if 'checking your browser' in response.text.lower() or 'challenge-running' in response.text.lower():
+            if self._is_cloudflare_challenge(response.content):
                 logger.error("⚠️ Cloudflare blocked order details")
                 raise Exception(f"Cloudflare blocked the order details request for {order_id}")
 
             response.raise_for_status()
 
-            order = self._parse_order_details_from_html(response.text, order_id)
-            logger.info(f"Order details retrieved for {order_id}")
-
-            return order
+            return response.text
 
         except Exception as e:
             logger.error(f"Get order details error: {e}", exc_info=True)
@@ -1043,56 +1444,47 @@ class SkroutzClientCffi:
 
     # Helper methods for parsing responses (reused from original client)
 
+    def _is_cloudflare_challenge(self, content: bytes) -> bool:
+        """Check whether a raw response body is a Cloudflare challenge page."""
+        return _CF_CHALLENGE_RE.search(content, 0, _CF_SCAN_BYTES) is not None
+
     def _extract_csrf_token(self, html: str) -> Optional[str]:
         """Extract CSRF token from HTML."""
-        # Try meta tag format
-        match = re.search(r'<meta\s+name=["\']csrf-token["\']\s+content=["\']([^"\']+)["\']', html)
-        if match:
-            return match.group(1)
+        # Single scan; the first token of each format is kept and the meta tag wins
+        tokens: dict[int, str] = {}
+        for match in _CSRF_TOKEN_RE.finditer(html):
+            if match.lastindex == 1:
+                return match.group(1)
+            tokens.setdefault(match.lastindex, match.group(match.lastindex))
 
-        # Try input field format
-        match = re.search(r'name=["\']authenticity_token["\'] value=["\']([^"\']+)["\']', html)
-        if match:
-            return match.group(1)
-
-        # Try Rails CSRF token
-        match = re.search(r'name=["\']csrf[_-]token["\'] value=["\']([^"\']+)["\']', html, re.IGNORECASE)
-        if match:
-            return match.group(1)
-
-        return None
+        return tokens.get(2) or tokens.get(3)
 
     def _parse_products_from_html(self, html: str) -> list[Product]:
         """Parse products from HTML response, excluding sponsored/promoted items."""
-        from bs4 import BeautifulSoup
-
         products = []
-        soup = BeautifulSoup(html, 'lxml')
+        root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
+        if root is None:
+            return products
 
         # Skroutz uses li elements with data-skuid attribute
-        product_elements = soup.find_all('li', attrs={'data-skuid': True})
+        product_elements = _SKU_CARDS_XPATH(root)
 
         if not product_elements:
             # Fallback to old parsing
-            product_elements = soup.find_all(['li', 'div'], class_=re.compile(r'product|item', re.I))
+            product_elements = _PRODUCT_CARDS_XPATH(root)
 
         for elem in product_elements[:50]:
             # Filter out sponsored/promoted products based on uBlock filters
-            classes = elem.get('class', [])
-            if isinstance(classes, str):
-                classes = [classes]
+            classes = elem.get('class', '').split()
 
             # Skip labeled/sponsored products
-            if any(cls in classes for cls in ['labeled-product', 'labeled-item', 'product-ad']):
+            if not _AD_CLASSES.isdisjoint(classes):
                 continue
 
             # Skip if parent is a selected-product-cards or sponsored container
-            parent = elem.parent
-            if parent:
-                parent_classes = parent.get('class', [])
-                if isinstance(parent_classes, str):
-                    parent_classes = [parent_classes]
-                if any(cls in parent_classes for cls in ['selected-product-cards', 'product-ad']):
+            parent = elem.getparent()
+            if parent is not None:
+                if not _AD_PARENT_CLASSES.isdisjoint(parent.get('class', '').split()):
                     continue
 
             # Skip if element has data-ad or sponsored attributes
@@ -1103,64 +1495,61 @@ class SkroutzClientCffi:
                 sku_id = elem.get('data-skuid', '')
 
                 # Find product link (usually has /s/{sku_id}/ in href)
-                link_elem = elem.find('a', href=re.compile(r'/s/\d+/'))
+                link_elem = next(
+                    (a for a in elem.iter('a') if _PRODUCT_HREF_RE.search(a.get('href', ''))), None
+                )
 
-                if not link_elem:
+                if link_elem is None:
                     continue
 
-                # Get product name from link text or title
-                name = link_elem.get('title') or link_elem.get_text(strip=True)
+                # Get product name from title, falling back to the link text
+                name = link_elem.get('title') or _element_text(link_elem)
 
                 # Get href for full URL
                 href = link_elem.get('href', '')
 
                 # Extract SKU ID from URL if not in data attribute
                 if not sku_id:
-                    id_match = re.search(r'/s/(\d+)/', href)
+                    id_match = _SKU_ID_RE.search(href)
                     if id_match:
                         sku_id = id_match.group(1)
 
-                # Find price - multiple strategies
-                price = Decimal("0")
+                # Find price - multiple strategies (in integer cents)
+                price_cents = 0
                 # Strategy 1: Look for elements with price-related classes
-                price_elem = elem.find(['span', 'div', 'strong'], class_=re.compile(r'price', re.I))
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    price_match = re.search(r'([\d.,]+)\s*€', price_text)
+                price_elem = _find_by_class(elem, ('span', 'div', 'strong'), _PRICE_CLASS)
+                if price_elem is not None:
+                    price_text = _element_text(price_elem)
+                    price_match = _EURO_RE.search(price_text)
                     if price_match:
-                        price_str = price_match.group(1).replace('.', '').replace(',', '.')
-                        try:
-                            price = Decimal(price_str)
-                        except:
-                            pass
+                        price_cents = _euro_to_cents(price_match.group(1)) or 0
 
                 # Strategy 2: If no price found, search in all text for € pattern
-                if price == Decimal("0"):
-                    all_text = elem.get_text()
-                    price_matches = re.findall(r'([\d.,]+)\s*€', all_text)
+                if price_cents == 0:
+                    all_text = ''.join(elem.itertext())
+                    price_matches = _EURO_RE.findall(all_text)
                     if price_matches:
                         # Get the first reasonable price (usually the main price)
                         for match in price_matches:
-                            try:
-                                price_str = match.replace('.', '').replace(',', '.')
-                                test_price = Decimal(price_str)
-                                if test_price > 0:
-                                    price = test_price
-                                    break
-                            except:
-                                continue
+                            test_cents = _euro_to_cents(match)
+                            if test_cents:
+                                price_cents = test_cents
+                                break
 
-                # Check availability
-                available = True
-                # Look for out of stock indicators
-                availability_text = elem.get_text().lower()
-                if any(phrase in availability_text for phrase in ['εξαντλημένο', 'out of stock', 'μη διαθέσιμο']):
+                # Check availability - prefer attribute/class markers over a full text scan
+                availability = elem.get('data-availability')
+                if availability:
+                    available = availability.lower().replace('_', '-') not in _UNAVAILABLE_MARKERS
+                elif not _UNAVAILABLE_MARKERS.isdisjoint(classes):
                     available = False
+                else:
+                    # Look for out of stock indicators in the card text
+                    available = _UNAVAILABLE_RE.search(''.join(elem.itertext())) is None
 
                 # Find image
-                image_elem = elem.find('img')
+                image_elem = elem.find('.//img')
                 image_url = None
-                if image_elem:
+                if image_elem is not None:
                     image_url = image_elem.get('src') or image_elem.get('data-src')
 
                 # Build full URL - remove query parameters that can cause issues
@@ -1172,16 +1561,17 @@ class SkroutzClientCffi:
                         full_url = f"{self.BASE_URL}{href}"
 
                     # Clean up URL - remove problematic query parameters but keep structure
-                    if full_url and '?' in full_url:
+                    query_start = full_url.find('?')
+                    if query_start >= 0:
                         # Only keep the base URL without query params for reliability
-                        full_url = full_url.split('?')[0]
+                        full_url = full_url[:query_start]
 
                 if name and sku_id:
                     product = Product(
                         id=sku_id,
                         sku_id=sku_id,
                         name=name,
-                        price=price,
+                        price=_cents_to_decimal(price_cents),
                         available=available,
                         image_url=image_url,
                         url=full_url,
@@ -1198,6 +1588,7 @@ class SkroutzClientCffi:
         """Parse cart from JSON response (Skroutz format with proposals/suborders)."""
         items = []
         total = Decimal("0")
+        item_count = 0
 
         # Skroutz cart.json structure: cart.proposals[].suborders[].items[]
         if 'cart' in cart_data:
@@ -1212,14 +1603,12 @@ class SkroutzClientCffi:
                     summary = first_proposal['summary']
                     total_str = summary.get('total_cost', '0 €')
                     # Parse "335,55 €" format
-                    total_match = re.search(r'([\d.,]+)', total_str)
+                    total_match = _PRICE_RE.search(total_str)
                     if total_match:
-                        total_clean = total_match.group(1).replace('.', '').replace(',', '.')
-                        try:
-                            total = Decimal(total_clean)
+                        total_cents = _euro_to_cents(total_match.group(1))
+                        if total_cents is not None:
+                            total = _cents_to_decimal(total_cents)
                             logger.info(f"Parsed total from summary: {total}")
-                        except:
-                            pass
 
                 # Extract items from packages (Skroutz uses packages, not suborders)
                 if 'packages' in first_proposal:
@@ -1236,24 +1625,23 @@ class SkroutzClientCffi:
 
                                     # Parse total_cost "136,25 €"
                                     total_cost_str = item_data.get('total_cost', '0 €')
-                                    total_cost_match = re.search(r'([\d.,]+)', total_cost_str)
-                                    subtotal = Decimal("0")
+                                    total_cost_match = _PRICE_RE.search(total_cost_str)
+                                    subtotal_cents = 0
                                     if total_cost_match:
-                                        subtotal_clean = total_cost_match.group(1).replace('.', '').replace(',', '.')
-                                        try:
-                                            subtotal = Decimal(subtotal_clean)
-                                        except:
-                                            pass
+                                        subtotal_cents = _euro_to_cents(total_cost_match.group(1)) or 0
 
-                                    # Calculate unit price
-                                    price = subtotal / quantity if quantity > 0 else Decimal("0")
+                                    # Calculate unit price (rounded to the nearest cent)
+                                    price_cents = (
+                                        (subtotal_cents + quantity // 2) // quantity if quantity > 0 else 0
+                                    )
+                                    subtotal = _cents_to_decimal(subtotal_cents)
 
                                     product = Product(
                                         id=line_item_id,
                                         sku_id=sku_id,
                                         name=product_name,
                                         maker=manufacturer,
-                                        price=price,
+                                        price=_cents_to_decimal(price_cents),
                                         available=True,
                                         url=item_data.get('link'),
                                         image_url=item_data.get('sku_image'),
@@ -1265,6 +1653,7 @@ class SkroutzClientCffi:
                                         subtotal=subtotal,
                                     )
                                     items.append(cart_item)
+                                    item_count += quantity
                                     logger.info(f"Parsed item: {product_name} x{quantity} = {subtotal}€")
 
                                 except Exception as e:
@@ -1274,13 +1663,11 @@ class SkroutzClientCffi:
         return Cart(
             items=items,
             total=total,
-            item_count=sum(item.quantity for item in items),
+            item_count=item_count,
         )
 
     def _parse_cart_from_html(self, html: str) -> Cart:
         """Parse cart from HTML response."""
-        from bs4 import BeautifulSoup
-
         # Save for debugging
         try:
             with open('/tmp/skroutz_cart.html', 'w', encoding='utf-8') as f:
@@ -1289,10 +1676,9 @@ class SkroutzClientCffi:
         except Exception as e:
             logger.warning(f"Could not save cart HTML: {e}")
 
-        # Check for Cloudflare challenge (but not just the beacon)
-        if ('checking your browser' in html.lower() or
-            'challenge-running' in html.lower() or
-            ('cloudflare' in html.lower() and '<title>Just a moment' in html)):
+        # Check for Cloudflare challenge (but not just the beacon). Characters encode
+        # to at least one byte, so this prefix covers the scanned byte prefix.
+        if self._is_cloudflare_challenge(html[:_CF_SCAN_BYTES].encode('utf-8')):
             logger.error("⚠️  CLOUDFLARE CHALLENGE DETECTED - Cart page is blocked")
             # Try to extract title for better error message
             title_match = re.search(r'<title>([^<]+)</title>', html, re.I)
@@ -1300,17 +1686,13 @@ class SkroutzClientCffi:
                 logger.error(f"   Page title: {title_match.group(1)}")
             raise Exception("Cloudflare challenge detected. The request was blocked by Cloudflare protection.")
 
-        soup = BeautifulSoup(html, 'lxml')
-        items = []
-        total = Decimal("0")
-
-        # Check if this is a React-based cart page (empty div#react-cart-page)
-        react_cart_div = soup.find('div', id='react-cart-page')
-        if react_cart_div and not react_cart_div.get_text(strip=True):
+        # Check if this is a React-based cart page (empty div#react-cart-page). It has
+        # no item markup, so look at the raw HTML before building a tree.
+        if _REACT_CART_EMPTY_RE.search(html):
             logger.info("Detected React-based cart page - data will be in JavaScript")
 
             # Try to extract cart count from JavaScript
-            cart_count_match = re.search(r'cart_items_count\s*=\s*(\d+)', html)
+            cart_count_match = _CART_ITEMS_COUNT_RE.search(html)
             if cart_count_match:
                 cart_count = int(cart_count_match.group(1))
                 logger.info(f"Found cart_items_count in JS: {cart_count}")
@@ -1326,16 +1708,27 @@ class SkroutzClientCffi:
                         item_count=cart_count,
                     )
 
+        root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
+        items = []
+        total = Decimal("0")
+        item_count = 0
+
+        if root is None:
+            return Cart()
+
         # Extract cart count from title
-        cart_title = soup.find('strong', class_=re.compile(r'cart-quantity', re.I))
-        if cart_title:
-            title_text = cart_title.get_text(strip=True)
+        cart_title = _find_by_class(root, ('strong',), _class_contains('cart-quantity'))
+        if cart_title is not None:
+            title_text = _element_text(cart_title)
             logger.info(f"Cart title: {title_text}")
 
-        # Try multiple selectors for cart items
-        cart_items = soup.find_all('li')  # Mini-cart uses simple li elements
+        # Mini-cart uses simple li elements; only consider those holding a product link
+        cart_items = _CART_ITEMS_XPATH(root)
         if not cart_items:
-            cart_items = soup.find_all(['div', 'tr'], class_=re.compile(r'cart.*item|line.*item', re.I))
+            cart_items = [
+                elem for elem in root.iter('div', 'tr')
+                if any(_CART_ITEM_CLASS_RE.search(cls) for cls in elem.get('class', '').split())
+            ]
 
         logger.info(f"Found {len(cart_items)} potential cart items")
 
@@ -1344,16 +1737,20 @@ class SkroutzClientCffi:
                 logger.debug(f"Processing cart item {idx}")
 
                 # Look for suborder-item-details link (Skroutz mini-cart format)
-                link_elem = item_elem.find('a', class_='suborder-item-details')
-                if not link_elem:
+                link_elem = next(
+                    (a for a in item_elem.iter('a') if _has_class(a, 'suborder-item-details')), None
+                )
+                if link_elem is None:
                     # Fallback to any product link
-                    link_elem = item_elem.find('a', href=re.compile(r'/s/\d+/'))
-                if not link_elem:
+                    link_elem = next(
+                        (a for a in item_elem.iter('a') if _PRODUCT_HREF_RE.search(a.get('href', ''))), None
+                    )
+                if link_elem is None:
                     logger.debug(f"  No link found in item {idx}")
                     continue
 
                 # Get product name from link text
-                name = link_elem.get_text(strip=True)
+                name = _element_text(link_elem)
                 if not name or len(name) < 3:
                     # Try getting from title attribute
                     name = link_elem.get('title', '')
@@ -1362,32 +1759,32 @@ class SkroutzClientCffi:
 
                 # Find quantity - look for <p class="quantity"><strong>X</strong></p>
                 quantity = 1
-                qty_paragraph = item_elem.find('p', class_='quantity')
-                if qty_paragraph:
-                    qty_strong = qty_paragraph.find('strong')
-                    if qty_strong:
-                        try:
-                            quantity = int(qty_strong.get_text(strip=True))
-                        except:
-                            pass
+                qty_paragraph = next((p for p in item_elem.iter('p') if _has_class(p, 'quantity')), None)
+                if qty_paragraph is not None:
+                    qty_strong = next(qty_paragraph.iter('strong'), None)
+                    if qty_strong is not None:
+                        quantity_text = _element_text(qty_strong)
+                        if quantity_text.isdecimal():
+                            quantity = int(quantity_text)
 
                 # Find price (might not be in mini-cart)
                 price = Decimal("0")
-                price_elem = item_elem.find(['span', 'div', 'strong'], class_=re.compile(r'price', re.I))
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    price_match = re.search(r'([\d.,]+)\s*€', price_text)
+                price_elem = _find_by_class(item_elem, ('span', 'div', 'strong'), _PRICE_CLASS)
+                if price_elem is not None:
+                    price_text = _element_text(price_elem)
+                    price_match = _EURO_RE.search(price_text)
                     if price_match:
-                        price_str = price_match.group(1).replace('.', '').replace(',', '.')
-                        try:
-                            price = Decimal(price_str)
-                        except:
-                            pass
+                        price_str = price_match.group(1).translate(_PRICE_TRANS)
+                        if price_str[:1].isdigit():
+                            try:
+                                price = _to_decimal(price_str)
+                            except InvalidOperation:
+                                pass
 
                 # Extract line_item_id from remove link for later operations
-                remove_link = item_elem.find('a', class_='remove')
+                remove_link = next((a for a in item_elem.iter('a') if _has_class(a, 'remove')), None)
                 line_item_id = ''
-                if remove_link:
+                if remove_link is not None:
                     remove_href = remove_link.get('href', '')
                     id_match = re.search(r'/remove_line_item/(\d+)', remove_href)
                     if id_match:
@@ -1406,29 +1803,28 @@ class SkroutzClientCffi:
                     subtotal=price * quantity if price > 0 else Decimal("0"),
                 )
                 items.append(cart_item)
+                item_count += quantity
                 logger.info(f"  ✓ Parsed: {name} x{quantity}")
 
             except Exception as e:
                 logger.warning(f"Failed to parse cart item {idx}: {e}", exc_info=True)
                 continue
 
-        total_elem = soup.find(['span', 'div'], class_=re.compile(r'total', re.I))
-        if total_elem:
-            total_text = total_elem.get_text(strip=True)
-            total_match = re.search(r'(\d+[.,]\d+)', total_text.replace('.', '').replace(',', '.'))
+        total_elem = _find_by_class(root, ('span', 'div'), _TOTAL_CLASS)
+        if total_elem is not None:
+            total_text = _element_text(total_elem)
+            total_match = _TOTAL_NUM_RE.search(total_text.translate(_PRICE_TRANS))
             if total_match:
-                total = Decimal(total_match.group(1))
+                total = _to_decimal(total_match.group(1))
 
         return Cart(
             items=items,
             total=total,
-            item_count=sum(item.quantity for item in items),
+            item_count=item_count,
         )
 
     def _parse_orders_from_json(self, orders_data: dict) -> list[Order]:
         """Parse orders from JSON response."""
-        orders = []
-
         # Try to find orders in different possible structures
         orders_list = []
         if isinstance(orders_data, list):
@@ -1438,149 +1834,240 @@ class SkroutzClientCffi:
         elif 'data' in orders_data:
             orders_list = orders_data['data']
 
-        for order_data in orders_list:
-            try:
-                order = Order(
-                    id=str(order_data.get('id', order_data.get('order_id', ''))),
-                    order_number=str(order_data.get('code', order_data.get('order_number', ''))),
-                    status=order_data.get('status', 'unknown'),
-                    created_at=datetime.fromisoformat(order_data.get('created_at', datetime.now().isoformat())),
-                    total=Decimal(str(order_data.get('total', order_data.get('amount', 0)))),
-                )
-                orders.append(order)
-            except Exception as e:
-                logger.warning(f"Failed to parse order from JSON: {e}")
-                continue
-
-        return orders
+        return [order for order in map(_build_order, orders_list) if order is not None]
 
     def _parse_orders_from_html(self, html: str) -> list[Order]:
         """Parse orders from HTML response."""
-        from bs4 import BeautifulSoup
+        return self._parse_orders_from_stream([html.encode('utf-8')], encoding='utf-8')
 
-        orders = []
-        soup = BeautifulSoup(html, 'lxml')
+    def _parse_orders_from_stream(self, chunks: Iterable[bytes], encoding: str = 'utf-8') -> list[Order]:
+        """
+        Parse orders from an HTML byte stream.
 
-        # Skroutz uses order-code class for order numbers
-        order_code_elements = soup.find_all('span', class_='order-code')
-        logger.info(f"Found {len(order_code_elements)} order-code elements")
+        Each order is extracted as soon as its container element is closed. Parsed
+        containers are cleared once an enclosing element closes without holding an
+        order code of its own, so memory stays proportional to a single order while
+        outer order containers still see the contents of nested ones.
 
-        for code_elem in order_code_elements:
-            try:
-                order_number = code_elem.get_text(strip=True)
-
-                # Extract order ID (remove prefix like "25" from "250921-2298786")
-                order_id_match = re.search(r'\d+-(\d+)', order_number)
-                order_id = order_id_match.group(1) if order_id_match else order_number
-
-                # Find parent container for this order
-                order_container = code_elem.find_parent(['div', 'article', 'section'])
-
-                status = "unknown"
-                created_at = datetime.now()
-                total = Decimal("0")
-
-                if order_container:
-                    # Find status
-                    status_elem = order_container.find(['span', 'div', 'p'], class_=re.compile(r'status|state', re.I))
-                    if status_elem:
-                        status = status_elem.get_text(strip=True)
-
-                    # Find date - look for datetime patterns
-                    date_elem = order_container.find(['span', 'time', 'p'], class_=re.compile(r'date|time|created', re.I))
-                    if date_elem:
-                        date_text = date_elem.get_text(strip=True)
-                        # Try multiple date formats
-                        for fmt in ['%d/%m/%Y %I:%M %p', '%d/%m/%Y', '%Y-%m-%d']:
-                            try:
-                                # Clean Greek am/pm indicators
-                                date_text_clean = date_text.replace(' μ.μ.', ' PM').replace(' π.μ.', ' AM')
-                                created_at = datetime.strptime(date_text_clean, fmt)
-                                break
-                            except:
-                                continue
-
-                    # Find total cost
-                    total_elem = order_container.find(['span', 'div', 'strong'], class_=re.compile(r'total|cost|price', re.I))
-                    if not total_elem:
-                        # Look for € symbol in text
-                        all_text = order_container.get_text()
-                        total_matches = re.findall(r'([\d.,]+)\s*€', all_text)
-                        if total_matches:
-                            # Get the largest amount (usually the total)
-                            for match in total_matches:
-                                try:
-                                    price_str = match.replace('.', '').replace(',', '.')
-                                    test_total = Decimal(price_str)
-                                    if test_total > total:
-                                        total = test_total
-                                except:
-                                    continue
+        Args:
+            chunks: HTML body chunks as they arrive
+            encoding: Character encoding of the body
 
-                if order_number:
-                    order = Order(
-                        id=order_id,
-                        order_number=order_number,
-                        status=status,
-                        created_at=created_at,
-                        total=total,
-                    )
-                    orders.append(order)
-                    logger.debug(f"Parsed order: {order_number}, status={status}, total={total}")
+        Returns:
+            List of parsed orders, in document order
+        """
+        # (document position of the order code, order) pairs
+        parsed: list[tuple[int, Order]] = []
+        # Default creation time of orders without a parsable date, shared by the page
+        now = datetime.now()
+        # Skroutz uses order-code class for order numbers. Each code is filed under its
+        # nearest div/article/section (the order row) as soon as the code is read.
+        pending_codes: dict[Optional[etree._Element], list[tuple[int, etree._Element]]] = {}
+        # Parsed containers not yet cleared, in the order they were closed
+        parsed_containers: list[etree._Element] = []
+        code_count = 0
+
+        parser = etree.HTMLPullParser(
+            events=('end',), tag=('span', 'div', 'article', 'section'), encoding=encoding
+        )
 
-            except Exception as e:
-                logger.warning(f"Failed to parse order: {e}")
-                continue
+        def parse_codes(codes: list[tuple[int, etree._Element]], container: Optional[etree._Element]) -> None:
+            for position, code_elem in codes:
+                order = self._parse_order_element(code_elem, container, now)
+                if order:
+                    parsed.append((position, order))
+
+        def handle_events() -> None:
+            nonlocal code_count
+            for _, elem in parser.read_events():
+                if elem.tag == 'span':
+                    if 'order-code' in elem.get('class', '').split():
+                        container = next(elem.iterancestors('div', 'article', 'section'), None)
+                        pending_codes.setdefault(container, []).append((code_count, elem))
+                        code_count += 1
+                    continue
+
+                # Order row closed - parse the order codes it directly holds
+                owned = pending_codes.pop(elem, None)
+                if owned:
+                    parse_codes(owned, elem)
+                    parsed_containers.append(elem)
+                    continue
+
+                # Elements close in document post-order, so the parsed containers
+                # nested in this one are at the end of the list
+                while parsed_containers and any(
+                    ancestor is elem for ancestor in parsed_containers[-1].iterancestors()
+                ):
+                    parsed_containers.pop().clear(keep_tail=True)
+
+        for chunk in chunks:
+            parser.feed(chunk)
+            handle_events()
+        parser.close()
+        handle_events()
+
+        # Order codes without any (closed) container element
+        for codes in pending_codes.values():
+            parse_codes(codes, None)
+
+        parsed.sort(key=lambda item: item[0])
+        orders = [order for _, order in parsed]
+
+        logger.info("Found %d order-code elements", code_count)
+        logger.info("Successfully parsed %d orders", len(orders))
+        return orders
+
+    def _parse_order_element(
+        self, code_elem: etree._Element, order_container: Optional[etree._Element], now: datetime
+    ) -> Optional[Order]:
+        """
+        Parse a single order from its order-code element and parent container.
+
+        Args:
+            code_elem: Element holding the order code
+            order_container: Element holding the order's other fields, if any
+            now: Creation time used when the order has no parsable date
+        """
+        try:
+            order_number = _element_text(code_elem)
+
+            # Extract order ID (remove prefix like "25" from "250921-2298786")
+            order_id_match = _ORDER_ID_RE.search(order_number)
+            order_id = order_id_match.group(1) if order_id_match else order_number
+
+            status = "unknown"
+            created_at = now
+            total = Decimal("0")
+
+            if order_container is not None:
+                # Find status, date and total elements in a single pass over the
+                # container, lower-casing each class attribute once
+                status_elem = date_elem = total_elem = None
+                for elem in _ORDER_FIELD_CANDIDATES_XPATH(order_container):
+                    tag = elem.tag
+                    cls = elem.get('class').lower()
+                    if status_elem is None and tag in ('span', 'div', 'p') and (
+                        'status' in cls or 'state' in cls
+                    ):
+                        status_elem = elem
+                    if date_elem is None and tag in ('span', 'time', 'p') and (
+                        'date' in cls or 'time' in cls or 'created' in cls
+                    ):
+                        date_elem = elem
+                    if total_elem is None and tag in ('span', 'div', 'strong') and (
+                        'total' in cls or 'cost' in cls or 'price' in cls
+                    ):
+                        total_elem = elem
+                    if status_elem is not None and date_elem is not None and total_elem is not None:
+                        break
+
+                if status_elem is not None:
+                    status = _element_text(status_elem)
+
+                # Find date - look for datetime patterns
+                if date_elem is not None:
+                    # Clean Greek am/pm indicators
+                    date_text = _element_text(date_elem).replace(' μ.μ.', ' PM').replace(' π.μ.', ' AM')
+                    # Pick the date format from the shape of the text
+                    try:
+                        if '/' in date_text:
+                            fmt = '%d/%m/%Y %I:%M %p' if ':' in date_text else '%d/%m/%Y'
+                            created_at = datetime.strptime(date_text, fmt)
+                        elif '-' in date_text:
+                            created_at = datetime.fromisoformat(date_text)
+                    except ValueError:
+                        pass
+
+                # Find total cost
+                extracted_total = _extract_total(order_container, total_elem)
+                if extracted_total is not None:
+                    total = extracted_total
+
+            if order_number:
+                logger.debug("Parsed order: %s, status=%s, total=%s", order_number, status, total)
+                return Order(
+                    id=order_id,
+                    order_number=order_number,
+                    status=status,
+                    created_at=created_at,
+                    total=total,
+                )
 
-        logger.info(f"Successfully parsed {len(orders)} orders")
+        except Exception as e:
+            logger.warning("Failed to parse order: %s", e)
+
+        return None
+
+    def _parse_order_details_batch(self, pages: list[tuple[str, str]]) -> list[Optional[Order]]:
+        """
+        Parse several order details pages, reusing the module-level HTML parser.
+
+        Args:
+            pages: (html, order_id) pairs
+
+        Returns:
+            Parsed orders in the same order as pages, None where parsing failed
+        """
+        orders = []
+        for html, order_id in pages:
+            try:
+                order = self._parse_order_details_from_html(html, order_id)
+                logger.info("Order details retrieved for %s", order_id)
+            except Exception as e:
+                logger.error("Failed to parse order details for %s: %s", order_id, e, exc_info=True)
+                order = None
+            orders.append(order)
         return orders
 
     def _parse_order_details_from_html(self, html: str, order_id: str) -> Optional[Order]:
         """Parse order details from HTML response."""
-        from bs4 import BeautifulSoup
-
-        soup = BeautifulSoup(html, 'lxml')
+        root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
         items = []
 
+        if root is None:
+            # Empty response: no items, but still return the order itself
+            root = etree.Element('html')
+
         # Skroutz uses class="suborder-item" for order items
-        item_elements = soup.find_all('div', class_='suborder-item')
-        logger.info(f"Found {len(item_elements)} suborder-item elements")
+        item_elements = _ORDER_ITEMS_XPATH(root)
+        logger.info("Found %d suborder-item elements", len(item_elements))
 
         for item_elem in item_elements:
             try:
                 # Find product name from link
-                name_elem = item_elem.find('a', href=re.compile(r'/s/\d+/'))
-                if not name_elem:
+                name_elem = next(
+                    (a for a in item_elem.iter('a') if _PRODUCT_HREF_RE.search(a.get('href', ''))), None
+                )
+                if name_elem is None:
                     logger.debug("No product link found in item")
                     continue
 
-                product_name = name_elem.get_text(strip=True)
+                product_name = _element_text(name_elem)
 
-                # Find quantity and price from suborder-item-numeric
-                numeric_elem = item_elem.find('p', class_='suborder-item-numeric')
                 quantity = 1
                 price = Decimal("0")
                 subtotal = Decimal("0")
 
-                if numeric_elem:
-                    # Structure: <span>2</span> <i>×</i> <span>8,53 €</span>
-                    spans = numeric_elem.find_all('span')
-                    if len(spans) >= 2:
-                        # First span is quantity
-                        try:
-                            quantity = int(spans[0].get_text(strip=True))
-                        except:
-                            pass
-
-                        # Second span is unit price
-                        price_text = spans[1].get_text(strip=True)
-                        price_match = re.search(r'([\d.,]+)', price_text)
-                        if price_match:
-                            price_str = price_match.group(1).replace('.', '').replace(',', '.')
+                # Quantity and price from suborder-item-numeric
+                # Structure: <span>2</span> <i>×</i> <span>8,53 €</span>
+                spans = _ORDER_ITEM_NUMERIC_SPANS_XPATH(item_elem)
+                if len(spans) >= 2:
+                    # First span is quantity
+                    quantity_text = _element_text(spans[0])
+                    if quantity_text.isdecimal():
+                        quantity = int(quantity_text)
+
+                    # Second span is unit price
+                    price_text = _element_text(spans[1])
+                    price_match = _PRICE_RE.search(price_text)
+                    if price_match:
+                        price_str = price_match.group(1).translate(_PRICE_TRANS)
+                        if price_str[:1].isdigit():
                             try:
-                                price = Decimal(price_str)
+                                price = _to_decimal(price_str)
                                 subtotal = price * quantity
-                            except:
+                            except InvalidOperation:
                                 pass
 
                 if product_name and len(product_name) > 3:
@@ -1591,29 +2078,29 @@ class SkroutzClientCffi:
                         subtotal=subtotal,
                     )
                     items.append(order_item)
-                    logger.debug(f"Parsed item: {product_name} x{quantity} @ {price}€")
+                    logger.debug("Parsed item: %s x%d @ %s€", product_name, quantity, price)
 
             except Exception as e:
-                logger.warning(f"Failed to parse order item: {e}")
+                logger.warning("Failed to parse order item: %s", e)
                 continue
 
-        logger.info(f"Parsed {len(items)} items from order")
+        logger.info("Parsed %d items from order", len(items))
 
         order_number = order_id
         status = "unknown"
         created_at = datetime.now()
         total = Decimal("0")
 
-        status_elem = soup.find(['span', 'div'], class_=re.compile(r'status', re.I))
-        if status_elem:
-            status = status_elem.get_text(strip=True).lower()
+        status_elem = _first(_DETAILS_STATUS_XPATH(root))
+        if status_elem is not None:
+            status = _element_text(status_elem).lower()
 
-        total_elem = soup.find(['span', 'div'], class_=re.compile(r'total', re.I))
-        if total_elem:
-            total_text = total_elem.get_text(strip=True)
-            total_match = re.search(r'(\d+[.,]\d+)', total_text.replace('.', '').replace(',', '.'))
+        total_elem = _first(_DETAILS_TOTAL_XPATH(root))
+        if total_elem is not None:
+            total_text = _element_text(total_elem)
+            total_match = _TOTAL_NUM_RE.search(total_text.translate(_PRICE_TRANS))
             if total_match:
-                total = Decimal(total_match.group(1))
+                total = _to_decimal(total_match.group(1))
 
         return Order(
             id=order_id,
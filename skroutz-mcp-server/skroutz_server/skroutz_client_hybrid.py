@@ -1,5 +1,6 @@
 """Hybrid Skroutz client using curl_cffi for search and Playwright for cart operations."""
 
+import asyncio
 import logging
 from typing import Optional
 
@@ -18,16 +19,27 @@ class SkroutzClientHybrid:
     - Playwright for cart operations (better for interactive features)
     """
 
-    def __init__(self, auth_manager: AuthManager, headless: bool = True) -> None:
+    def __init__(
+        self,
+        auth_manager: AuthManager,
+        headless: bool = True,
+        reuse_context: bool = False,
+        page_pool_size: int = 4,
+    ) -> None:
         """
         Initialize the hybrid client.
 
         Args:
             auth_manager: Authentication manager instance
             headless: Run Playwright browser in headless mode
+            reuse_context: Keep the Playwright browser running across close() calls so
+                later operations don't pay for relaunching Chromium
+            page_pool_size: Number of Playwright pages available for concurrent operations
         """
         self.auth_manager = auth_manager
         self.headless = headless
+        self.reuse_context = reuse_context
+        self.page_pool_size = page_pool_size
 
         # Initialize both clients
         self.cffi_client = SkroutzClientCffi(auth_manager)
@@ -45,6 +57,12 @@ class SkroutzClientHybrid:
             logger.info("Playwright client initialized for cart operations")
         return self.playwright_client
 
+    async def _ensure_page_pool(self) -> SkroutzClientPlaywright:
+        """Lazily initialize the Playwright client and its page pool for pooled_page()."""
+        playwright_client = await self._ensure_playwright()
+        await playwright_client.init_page_pool(size=self.page_pool_size)
+        return playwright_client
+
     def login(self, credentials: AuthCredentials) -> bool:
         """
         Authenticate with skroutz.gr using curl_cffi.
@@ -57,12 +75,16 @@ class SkroutzClientHybrid:
         """
         return self.cffi_client.login(credentials)
 
-    def logout(self) -> None:
-        """Logout and clear session."""
-        self.cffi_client.logout()
+    async def logout(self) -> None:
+        """
+        Logout and clear session.
+
+        Must be awaited: the Playwright browser is logged out too, while it is still
+        authenticated, before the shared session is cleared.
+        """
         if self.playwright_client:
-            # Note: logout in playwright client is async, but we'll just clear session
-            self.playwright_client.auth_manager.clear_session()
+            await self.playwright_client.logout()
+        self.cffi_client.logout()
 
     async def search_products(self, query: str) -> list[Product]:
         """
@@ -160,12 +182,59 @@ class SkroutzClientHybrid:
             Order object or None
         """
         logger.info(f"Using Playwright for get_order_details: {order_id}")
-        playwright_client = await self._ensure_playwright()
-        return await playwright_client.get_order_details(order_id)
+        playwright_client = await self._ensure_page_pool()
+        async with playwright_client.pooled_page() as page:
+            return await playwright_client.get_order_details(order_id, page=page)
+
+    async def get_orders_with_details(self, include_history: bool = True, concurrency: int = 4) -> list[Order]:
+        """
+        Get orders with their items, fetching order details concurrently.
+
+        Details are loaded on the Playwright client's page pool, which shares one
+        browser context.
+
+        Args:
+            include_history: Include order history
+            concurrency: Maximum number of order details pages loaded at once
+
+        Returns:
+            List of orders; items are filled in where details could be loaded
+        """
+        logger.info("Using Playwright for get_orders_with_details")
+        playwright_client = await self._ensure_page_pool()
+        orders = await playwright_client.get_orders(include_history)
+        if not orders:
+            return orders
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_details(order_id: str) -> Optional[Order]:
+            async with semaphore, playwright_client.pooled_page() as page:
+                return await playwright_client.get_order_details(order_id, page=page)
+
+        details = await asyncio.gather(*(fetch_details(order.id) for order in orders))
+
+        return [
+            order.model_copy(update={'items': order_details.items}) if order_details else order
+            for order, order_details in zip(orders, details)
+        ]
+
+    async def close(self, force: bool = False) -> None:
+        """
+        Clean up resources.
+
+        With reuse_context the browser and HTTP session stay open so the client can keep
+        being used; pass force=True to release them anyway.
+
+        Args:
+            force: Close everything even when reuse_context is set
+        """
+        if self.reuse_context and not force:
+            logger.info("Keeping Playwright browser alive for reuse")
+            return
 
-    async def close(self) -> None:
-        """Clean up resources."""
         self.cffi_client.close()
         if self.playwright_client:
             await self.playwright_client.close()
+            self.playwright_client = None
 
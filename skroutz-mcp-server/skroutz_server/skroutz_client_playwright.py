@@ -1,16 +1,39 @@
 """Skroutz.gr client using Playwright for browser automation with Cloudflare bypass."""
 
+import json
 import logging
+import os
 import re
 import asyncio
 import random
-from decimal import Decimal
-from typing import Any, Optional
+from decimal import Decimal, InvalidOperation
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
 from datetime import datetime
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+from pathlib import Path
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    BrowserContext,
+    Error as PlaywrightError,
+    Page,
+    Playwright,
+    Route,
+    TimeoutError as PlaywrightTimeoutError,
+)
+
+from lxml import etree
 
 from .auth import AuthManager
 from .models import AuthCredentials, Cart, CartItem, Order, OrderItem, Product
+from .skroutz_client_cffi import (
+    _AD_CLASSES,
+    _AD_PARENT_CLASSES,
+    _HTML_PARSER,
+    _UNAVAILABLE_RE,
+    _element_text,
+    _first,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,336 +45,883 @@ except ImportError:
     logger.warning("playwright-stealth not available, using built-in anti-detection only")
 
 
+# Chromium flags for launched browsers (see _launch_browser)
+_LAUNCH_ARGS = (
+    '--disable-dev-shm-usage',
+    '--disable-web-security',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-background-timer-throttling',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-renderer-backgrounding',
+    '--disable-infobars',
+    '--window-size=1920,1080',
+    '--start-maximized',
+    '--disable-extensions',
+    '--disable-hang-monitor',
+    '--no-first-run',
+    '--no-default-browser-check',
+    '--no-pings',
+    '--password-store=basic',
+    '--use-mock-keychain',
+)
+
+# Login and cart form controls. Each list is joined into one CSS union so a single
+# locator query finds the first visible match instead of probing selectors one by one.
+_EMAIL_INPUTS = (
+    'input[name="username"]',
+    'input[name="email"]',
+    'input[type="email"]',
+    'input[id*="email"]',
+    'input[id*="username"]',
+    'input[placeholder*="email"]',
+)
+_PASSWORD_INPUTS = (
+    'input[name="password"]',
+    'input[type="password"]',
+    'input[id*="password"]',
+    'input[placeholder*="password"]',
+    'input[placeholder*="κωδικός"]',
+)
+_SUBMIT_BUTTONS = ('button[type="submit"]', 'input[type="submit"]')
+_EMAIL_INPUT_SELECTOR = ', '.join(f'{selector}:visible' for selector in _EMAIL_INPUTS)
+_PASSWORD_INPUT_SELECTOR = ', '.join(f'{selector}:visible' for selector in _PASSWORD_INPUTS)
+_SUBMIT_SELECTOR = ', '.join(f'{selector}:visible' for selector in _SUBMIT_BUTTONS)
+_LOGIN_ERROR_SELECTOR = '.error, .alert, .message, .error-message'
+_CONTINUE_BUTTON_NAME = re.compile(r'Συνέχεια|Continue')
+_LOGIN_BUTTON_NAME = re.compile(r'Σύνδεση|Login|Είσοδος')
+_ADD_TO_CART_SELECTOR = ', '.join(f'{selector}:visible' for selector in [
+    'button:has-text("Προσθήκη στο καλάθι")',
+    'button:has-text("Αγορά μέσω Skroutz")',
+    'button:has-text("Προσθήκη")',
+    'a:has-text("Προσθήκη στο καλάθι")',
+    'a:has-text("Αγορά μέσω Skroutz")',
+    'button[class*="add-to-cart"]',
+    'button[class*="add_to_cart"]',
+    'button[data-analytics*="cart"]',
+])
+_QUANTITY_INPUT_SELECTOR = 'input[name="quantity"], input[type="number"]'
+_CART_QUANTITY_INPUT_SELECTOR = 'input[name*="quantity"], input[type="number"]'
+_UPDATE_BUTTON_SELECTOR = 'button:has-text("Ενημέρωση"), button:has-text("Update")'
+_SEARCH_RESULT_SELECTOR = 'li[data-skuid]'
+# Product cards or an empty-results message, whichever a search page renders
+_SEARCH_DONE_SELECTOR = ', '.join([
+    _SEARCH_RESULT_SELECTOR,
+    '[class*="no-results"]',
+    '[class*="noresults"]',
+    '[class*="empty-state"]',
+    '[id*="no-results"]',
+])
+_TURNSTILE_IFRAME_SELECTOR = 'iframe[src*="cloudflare"], iframe[src*="turnstile"]'
+_TURNSTILE_CHECKBOX_SELECTOR = 'input[type="checkbox"], #cf-turnstile'
+# Elements whose presence means a page has rendered enough to be parsed
+_CART_CONTENT_SELECTOR = '[class*="cart"][class*="item"], [class*="total"], [class*="empty"]'
+_ORDERS_CONTENT_SELECTOR = '[class*="order"]'
+_ORDER_DETAILS_CONTENT_SELECTOR = '[class*="item"], [class*="product"], [class*="status"]'
+
+# In-page login: fills the login form step shown by the current document and submits
+# it. Resolves to the submitted step ("email" or "password"), or "" when no field shows
+# up so the caller can fall back to the locator based flow. Submitting the email step
+# navigates to the password page, so the submit is deferred until the script has
+# returned instead of destroying its execution context mid-call.
+_LOGIN_FORM_JS = """async ({email, password, emailSelector, passwordSelector, submitSelector}) => {
+    const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+    const find = (selector) => [...document.querySelectorAll(selector)].find(visible);
+    const waitFor = async (selector, timeout) => {
+        for (let waited = 0; waited < timeout; waited += 100) {
+            const el = find(selector);
+            if (el) return el;
+            await new Promise((resolve) => setTimeout(resolve, 100));
+        }
+        return find(selector);
+    };
+    const fill = (input, value) => {
+        input.focus();
+        // Go through the native setter so framework-controlled inputs see the change
+        Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set.call(input, value);
+        input.dispatchEvent(new Event('input', {bubbles: true}));
+        input.dispatchEvent(new Event('change', {bubbles: true}));
+    };
+    const submit = (input) => {
+        const button = find(submitSelector);
+        if (button) {
+            setTimeout(() => button.click(), 0);
+        } else if (input.form) {
+            setTimeout(() => input.form.requestSubmit(), 0);
+        } else {
+            return false;
+        }
+        return true;
+    };
+
+    if (!await waitFor(`${emailSelector}, ${passwordSelector}`, 5000)) return '';
+
+    // Password step (or a single-step form showing both fields)
+    const passwordInput = find(passwordSelector);
+    if (passwordInput) {
+        const emailInput = find(emailSelector);
+        if (emailInput) fill(emailInput, email);
+        fill(passwordInput, password);
+        return submit(passwordInput) ? 'password' : '';
+    }
+
+    // Email step: continuing shows the password field
+    const emailInput = find(emailSelector);
+    fill(emailInput, email);
+    return submit(emailInput) ? 'email' : '';
+}"""
+
+# Text patterns applied to every parsed page element
+_PRICE_EURO_RE = re.compile(r'([\d.,]+)\s*€')
+_DECIMAL_RE = re.compile(r'(\d+[.,]\d+)')
+_SKU_PATH_RE = re.compile(r'/s/(\d+)')
+_DIGITS_RE = re.compile(r'\d+')
+# Greek amounts to Decimal syntax in one pass: drop thousands dots, decimal comma to dot
+_PRICE_TRANSLATE = str.maketrans({'.': '', ',': '.'})
+
+# Page parser XPaths, compiled once so element matching runs in libxml2. Class and
+# name tests are case-insensitive substring matches.
+_LOWER = "'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'"
+_CLASS = f"translate(@class, {_LOWER})"
+_SKU_ITEMS_XPATH = etree.XPath("//li[@data-skuid]")
+_PRODUCT_ITEMS_XPATH = etree.XPath(
+    f"//*[self::li or self::div][contains({_CLASS}, 'product') or contains({_CLASS}, 'item')]"
+)
+# Name, link, price and image elements of a product card in a single evaluation
+# (returned in document order, see _product_fields)
+_PRODUCT_FIELDS_XPATH = etree.XPath(
+    "(.//*[self::a or self::h2 or self::h3 or self::h4])[1]"
+    " | (.//a[@href])[1]"
+    f" | (.//*[self::span or self::div or self::strong][contains({_CLASS}, 'price')])[1]"
+    " | (.//img)[1]"
+)
+# "cart.*item": an "item" somewhere after the first "cart"
+_CART_ITEMS_XPATH = etree.XPath(
+    f"//*[self::div or self::tr][contains(substring-after({_CLASS}, 'cart'), 'item')]"
+)
+_CART_NAME_XPATH = etree.XPath("(.//*[self::a or self::span or self::h3])[1]")
+_CART_PRICE_XPATH = etree.XPath(f"(.//*[self::span or self::div][contains({_CLASS}, 'price')])[1]")
+_CART_QUANTITY_XPATH = etree.XPath(
+    f"(.//*[self::input or self::span][contains(translate(@name, {_LOWER}), 'quantity')])[1]"
+)
+_ORDER_ELEMENTS_XPATH = etree.XPath(f"//*[self::div or self::tr][contains({_CLASS}, 'order')]")
+_ORDER_ID_CANDIDATES_XPATH = etree.XPath(".//*[self::span or self::a]")
+_ORDER_ITEMS_XPATH = etree.XPath(
+    f"//*[self::div or self::tr][contains({_CLASS}, 'item') or contains({_CLASS}, 'product')]"
+)
+# Name, quantity and price candidates of an order details item, in document order
+# (split by _order_item_fields)
+_ORDER_ITEM_FIELDS_XPATH = etree.XPath(".//*[self::a or self::span or self::td]")
+_TOTAL_XPATH = etree.XPath(f"(.//*[self::span or self::div][contains({_CLASS}, 'total')])[1]")
+# First status element and first total element in a single evaluation (split by
+# _extract_status_total)
+_STATUS_TOTAL_XPATH = etree.XPath(
+    f"(.//*[self::span or self::div][contains({_CLASS}, 'status')])[1]"
+    f" | (.//*[self::span or self::div][contains({_CLASS}, 'total')])[1]"
+)
+
+# In-page product card extraction. Mirrors _product_card: the same card lookup
+# and per-card fields, with element text joined from stripped text nodes.
+_PRODUCT_CARDS_JS = """() => {
+    const text = (el) => {
+        const parts = [];
+        const walker = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+        while (walker.nextNode()) parts.push(walker.currentNode.data.trim());
+        return parts.join('');
+    };
+    let cards = [...document.querySelectorAll('li[data-skuid]')];
+    if (!cards.length) {
+        cards = [...document.querySelectorAll('li, div')].filter((el) => {
+            const cls = (el.getAttribute('class') || '').toLowerCase();
+            return cls.includes('product') || cls.includes('item');
+        });
+    }
+    return cards.slice(0, 50).map((el) => {
+        const name = el.querySelector('a, h2, h3, h4');
+        const link = el.querySelector('a[href]');
+        const price = el.querySelector(':is(span, div, strong)[class*="price" i]');
+        const image = el.querySelector('img');
+        const parent = el.parentElement;
+        return {
+            skuid: el.getAttribute('data-skuid') || '',
+            classes: el.getAttribute('class') || '',
+            parentClasses: (parent && parent.getAttribute('class')) || '',
+            ad: el.getAttribute('data-ad'),
+            sponsored: el.getAttribute('data-sponsored'),
+            name: name ? text(name) : null,
+            href: link ? link.getAttribute('href') : null,
+            priceText: price ? text(price) : null,
+            text: el.textContent,
+            image: image ? (image.getAttribute('src') || image.getAttribute('data-src')) : null,
+        };
+    });
+}"""
+
+# Resource types blocked while scraping pages whose HTML is all we need
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media", "stylesheet"})
+
+# Failure screenshots are opt-in: they cost a full capture and encode per failure
+_DEBUG_SCREENSHOTS = os.environ.get("SKROUTZ_DEBUG_SCREENSHOTS") == "1"
+# Dumping parsed search pages to /tmp is opt-in as well
+_DUMP_HTML = os.environ.get("SKROUTZ_DUMP_HTML") == "1"
+
+# Cloudflare challenge markers, matched once against the initial page content
+_CF_CHALLENGE_RE = re.compile('|'.join(map(re.escape, [
+    'challenge-platform',
+    'cf-browser-verification',
+    'cf-challenge',
+    'cf-turnstile',
+    'Just a moment',
+    'Checking your browser',
+    'Επαληθεύστε ότι είστε άνθρωπος',
+])))
+
+# Logged-in page markers, matched case-insensitively without lowercasing the page
+_LOGGED_IN_RE = re.compile('logout|αποσύνδεση', re.I)
+
+# Browser-side logged-in check: account links or the markers above anywhere in the
+# markup, answered in one round trip without shipping the DOM to Python
+_LOGGED_IN_JS = """(pattern) =>
+    !!document.querySelector('a[href*="logout"], a[href*="account"]')
+    || new RegExp(pattern, 'i').test(document.documentElement.outerHTML)
+"""
+
+# Browser-side predicate that holds once the challenge widgets are gone and the
+# page is not on a challenge URL (Skroutz serves challenges at the original URL,
+# so the URL alone does not tell the challenge is solved)
+_CF_CLEARED_JS = """() =>
+    !document.querySelector(
+        '#challenge-form, #cf-turnstile, .cf-browser-verification, '
+        + 'iframe[src*="challenges.cloudflare.com"], iframe[src*="challenge-platform"]'
+    ) && !location.href.includes('cdn-cgi/challenge')
+"""
+
+# Anti-detection script installed into every browser context
+_STEALTH_JS = """
+// Override the navigator.webdriver property
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined,
+    configurable: true
+});
+
+// Remove automation indicators
+delete navigator.__proto__.webdriver;
+
+// Override navigator.plugins to make it realistic
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [
+        {
+            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
+            description: "Portable Document Format",
+            filename: "internal-pdf-viewer",
+            length: 1,
+            name: "Chrome PDF Plugin"
+        },
+        {
+            0: {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"},
+            description: "Portable Document Format",
+            filename: "mhjfbmdgcfjbbpaeojofohoefgiehjai",
+            length: 1,
+            name: "Chrome PDF Viewer"
+        },
+        {
+            0: {type: "application/x-nacl", suffixes: "", description: "Native Client Executable"},
+            1: {type: "application/x-pnacl", suffixes: "", description: "Portable Native Client Executable"},
+            description: "",
+            filename: "internal-nacl-plugin",
+            length: 2,
+            name: "Native Client"
+        }
+    ]
+});
+
+// Override navigator.languages
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['el-GR', 'el', 'en-US', 'en']
+});
+
+// Override Chrome runtime
+window.chrome = {
+    runtime: {},
+    loadTimes: function() {},
+    csi: function() {},
+    app: {}
+};
+
+// Override permissions API
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+);
+
+// Add missing properties
+Object.defineProperty(navigator, 'maxTouchPoints', {
+    get: () => 0
+});
+
+Object.defineProperty(navigator, 'vendor', {
+    get: () => 'Google Inc.'
+});
+
+// Mock battery API
+Object.defineProperty(navigator, 'getBattery', {
+    value: () => Promise.resolve({
+        charging: true,
+        chargingTime: 0,
+        dischargingTime: Infinity,
+        level: 1
+    })
+});
+
+// Prevent detection via connection
+Object.defineProperty(navigator, 'connection', {
+    get: () => ({
+        effectiveType: '4g',
+        rtt: 100,
+        downlink: 10,
+        saveData: false
+    })
+});
+
+// Override mediaDevices
+if (navigator.mediaDevices && navigator.mediaDevices.enumerateDevices) {
+    const originalEnumerateDevices = navigator.mediaDevices.enumerateDevices.bind(navigator.mediaDevices);
+    navigator.mediaDevices.enumerateDevices = () => {
+        return originalEnumerateDevices().then(devices => {
+            return devices.map((device, index) => {
+                return {
+                    deviceId: `device-${index}`,
+                    groupId: `group-${index}`,
+                    kind: device.kind,
+                    label: ''
+                };
+            });
+        });
+    };
+}
+
+// Canvas fingerprinting protection
+const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
+HTMLCanvasElement.prototype.toDataURL = function(type) {
+    if (type === 'image/png' && this.width === 16 && this.height === 16) {
+        return 'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==';
+    }
+    return originalToDataURL.apply(this, arguments);
+};
+
+// WebGL fingerprinting protection
+const getParameter = WebGLRenderingContext.prototype.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) {
+        return 'Intel Inc.';
+    }
+    if (parameter === 37446) {
+        return 'Intel Iris OpenGL Engine';
+    }
+    return getParameter.call(this, parameter);
+};
+
+// Hide automation via Notification
+const originalPermissions = Notification.permission;
+Object.defineProperty(Notification, 'permission', {
+    get: () => originalPermissions === 'denied' ? 'default' : originalPermissions
+});
+"""
+
+
+def _element_string(elem: etree._Element) -> Optional[str]:
+    """Return the only string inside an element, like BeautifulSoup's Tag.string."""
+    while len(elem) == 1 and not elem.text and not elem[0].tail:
+        elem = elem[0]
+    return elem.text if len(elem) == 0 else None
+
+
+def _price_to_decimal(amount: str) -> Decimal:
+    """Convert a Greek-formatted amount (e.g. "1.234,50") to Decimal, or 0 if it is not a number."""
+    if not amount:
+        return Decimal("0")
+    try:
+        return Decimal(amount.translate(_PRICE_TRANSLATE))
+    except InvalidOperation:
+        return Decimal("0")
+
+
+def _product_fields(elem: etree._Element) -> tuple[
+    Optional[etree._Element], Optional[etree._Element], Optional[etree._Element], Optional[etree._Element]
+]:
+    """
+    Split a product card's _PRODUCT_FIELDS_XPATH result into its name, link, price
+    and image elements.
+
+    Only the name and link lookups can return the same tags. The first link never
+    precedes the first name element, so document order tells them apart.
+    """
+    name_elem = link_elem = price_elem = image_elem = None
+    for node in _PRODUCT_FIELDS_XPATH(elem):
+        tag = node.tag
+        if tag == 'img':
+            image_elem = node
+        elif tag in ('span', 'div', 'strong'):
+            price_elem = node
+        else:
+            if name_elem is None:
+                name_elem = node
+            if link_elem is None and tag == 'a' and node.get('href') is not None:
+                link_elem = node
+    return name_elem, link_elem, price_elem, image_elem
+
+
+def _product_card(elem: etree._Element) -> dict[str, Any]:
+    """Collect the fields of a product card element, as returned by _PRODUCT_CARDS_JS."""
+    name_elem, link_elem, price_elem, image_elem = _product_fields(elem)
+    parent = elem.getparent()
+    return {
+        'skuid': elem.get('data-skuid', ''),
+        'classes': elem.get('class', ''),
+        'parentClasses': parent.get('class', '') if parent is not None else '',
+        'ad': elem.get('data-ad'),
+        'sponsored': elem.get('data-sponsored'),
+        'name': _element_text(name_elem) if name_elem is not None else None,
+        'href': link_elem.get('href', '') if link_elem is not None else None,
+        'priceText': _element_text(price_elem) if price_elem is not None else None,
+        'text': ''.join(elem.itertext()),
+        'image': (
+            image_elem.get('src') or image_elem.get('data-src') if image_elem is not None else None
+        ),
+    }
+
+
+def _product_cards_from_html(html: str) -> list[dict[str, Any]]:
+    """Collect the product cards of a search results page from its HTML."""
+    root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
+    if root is None:
+        return []
+
+    # Prefer elements with data-skuid attribute
+    product_elements = _SKU_ITEMS_XPATH(root)
+    logger.info("Found %d elements with data-skuid", len(product_elements))
+
+    if not product_elements:
+        # Fallback to class-based parsing
+        product_elements = _PRODUCT_ITEMS_XPATH(root)
+        logger.info("Fallback found %d product/item elements", len(product_elements))
+
+    return [_product_card(elem) for elem in product_elements[:50]]
+
+
+def _order_item_fields(item_elem: etree._Element) -> tuple[
+    Optional[etree._Element], Optional[etree._Element], Optional[etree._Element]
+]:
+    """
+    Find the name, quantity and price elements of an order details item in one walk.
+
+    The name is the first a/span/td, the quantity the first span/td with a number as
+    its only string, and the price the first span/td with a price class.
+    """
+    nodes = _ORDER_ITEM_FIELDS_XPATH(item_elem)
+    if not nodes:
+        return None, None, None
+    candidates = [node for node in nodes if node.tag != 'a']
+    price_elem = next((node for node in candidates if 'price' in node.get('class', '').lower()), None)
+    return nodes[0], _first_with_number(candidates), price_elem
+
+
+def _extract_status_total(root: etree._Element) -> tuple[str, Decimal]:
+    """
+    Extract the status and total of an order (or order page) in one evaluation.
+
+    Returns:
+        The lowercased status text ("unknown" if there is none) and the total (0 if
+        there is none)
+    """
+    status_elem = total_elem = None
+    # The union is in document order and one element can match both
+    for node in _STATUS_TOTAL_XPATH(root):
+        classes = node.get('class', '').lower()
+        if status_elem is None and 'status' in classes:
+            status_elem = node
+        if total_elem is None and 'total' in classes:
+            total_elem = node
+
+    status = _element_text(status_elem).lower() if status_elem is not None else "unknown"
+    total = Decimal("0")
+    if total_elem is not None:
+        total_match = _DECIMAL_RE.search(_element_text(total_elem).translate(_PRICE_TRANSLATE))
+        if total_match:
+            total = Decimal(total_match.group(1))
+    return status, total
+
+
+def _first_int(text: str) -> Optional[int]:
+    """Return the first run of digits in text as an int, or None if there is none."""
+    # Quantity cells usually hold just the number, which needs no regex search
+    if text.isdecimal():
+        return int(text)
+    match = _DIGITS_RE.search(text)
+    return int(match.group()) if match else None
+
+
+def _first_with_number(elements: list[etree._Element]) -> Optional[etree._Element]:
+    """Return the first element whose only string contains a number."""
+    for elem in elements:
+        string = _element_string(elem)
+        if string and _DIGITS_RE.search(string):
+            return elem
+    return None
+
+
+def _write_debug_file(path: str, content: str) -> None:
+    """Write page content to a file for debugging, logging instead of raising on failure."""
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        logger.info("Saved HTML to %s", path)
+    except OSError as e:
+        logger.warning("Could not write %s: %s", path, e)
+
+
+def _write_storage_state(path: str, state: dict[str, Any]) -> None:
+    """Write a browser storage state file readable only by its owner."""
+    # Create the file with owner-only permissions so the cookies are never exposed
+    with os.fdopen(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w') as f:
+        json.dump(state, f)
+    # Files written before with broader permissions keep their mode on open
+    os.chmod(path, 0o600)
+
+
+async def _block_static_resources(route: Route) -> None:
+    """Abort requests for resources that scraping doesn't need."""
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+def _remove_button_selector(product_id: str) -> str:
+    """Build a selector for the remove control of one cart row (line item or SKU id)."""
+    value = product_id.replace('\\', '\\\\').replace('"', '\\"')
+    return ', '.join([
+        f'a[href$="/remove_line_item/{value}"]',
+        f'[data-product-id="{value}"] [class*="remove"]',
+        f'[data-sku="{value}"] [class*="remove"]',
+        f'[data-sku-id="{value}"] [class*="remove"]',
+    ])
+
+
 class SkroutzClientPlaywright:
     """Client for interacting with skroutz.gr using Playwright with anti-detection."""
 
     BASE_URL = "https://www.skroutz.gr"
 
-    def __init__(self, auth_manager: AuthManager, headless: bool = True) -> None:
+    # Playwright driver and browsers shared by every client in the process, keyed by
+    # (cdp_endpoint, headless) and reference counted so the last close() stops them.
+    # They belong to the event loop that started them (see _shared_state_lock).
+    _shared_loop: Optional[asyncio.AbstractEventLoop] = None
+    _shared_lock: Optional[asyncio.Lock] = None
+    _shared_playwright: Optional[Playwright] = None
+    _shared_browsers: dict[tuple[Optional[str], bool], Browser] = {}
+    _shared_refcounts: dict[tuple[Optional[str], bool], int] = {}
+
+    def __init__(
+        self,
+        auth_manager: AuthManager,
+        headless: bool = True,
+        cdp_endpoint: Optional[str] = None,
+        storage_state_path: Optional[str] = None,
+    ) -> None:
         """
         Initialize the Skroutz Playwright client.
 
         Args:
             auth_manager: Authentication manager instance
             headless: Run browser in headless mode (note: headless may trigger more Cloudflare checks)
+            cdp_endpoint: CDP URL of an already running Chromium to attach to instead of
+                launching one (e.g. started with --remote-debugging-port=9222). Defaults to
+                the SKROUTZ_CDP_URL environment variable.
+            storage_state_path: File where the browser storage state (cookies and local
+                storage) is kept between runs. Defaults to ~/.skroutz_playwright_state.json
         """
         self.auth_manager = auth_manager
         self.headless = headless
+        self.cdp_endpoint = cdp_endpoint or os.environ.get("SKROUTZ_CDP_URL")
+        if storage_state_path is None:
+            storage_state_path = str(Path.home() / ".skroutz_playwright_state.json")
+        self.storage_state_path = storage_state_path
+        # False when attached to the default context of a shared browser we don't own
+        self._owns_context = True
         self.playwright: Optional[Playwright] = None
         self.browser: Optional[Browser] = None
+        # Event loop the shared browser was acquired on
+        self._browser_loop: Optional[asyncio.AbstractEventLoop] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
+        # Extra pages for running independent operations concurrently (see init_page_pool)
+        self._page_pool: Optional[asyncio.Queue[Page]] = None
+        # Last storage state written to storage_state_path by _save_cookies
+        self._saved_storage_state: Optional[dict[str, Any]] = None
+        # Serializes _save_cookies, whose file writes run in worker threads
+        self._save_lock = asyncio.Lock()
+        # Serialize the first use of the browser and of the page pool, so concurrent
+        # callers share one context and one pool
+        self._start_lock = asyncio.Lock()
+        self._pool_lock = asyncio.Lock()
+        # Fire-and-forget tasks (debug screenshots) kept referenced until they finish
+        self._background_tasks: set[asyncio.Task] = set()
 
     async def _start_browser(self) -> None:
         """Start the Playwright browser with anti-detection settings."""
-        if self.playwright is None:
-            self.playwright = await async_playwright().start()
-
-            # Launch with comprehensive anti-detection arguments
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-dev-shm-usage',
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-web-security',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-features=VizDisplayCompositor',
-                    '--disable-background-timer-throttling',
-                    '--disable-backgrounding-occluded-windows',
-                    '--disable-renderer-backgrounding',
-                    '--disable-infobars',
-                    '--window-size=1920,1080',
-                    '--start-maximized',
-                    '--disable-extensions',
-                    '--disable-hang-monitor',
-                    '--disable-gpu',
-                    '--no-first-run',
-                    '--no-default-browser-check',
-                    '--no-pings',
-                    '--password-store=basic',
-                    '--use-mock-keychain',
-                ]
-            )
+        async with self._start_lock:
+            if self.playwright is not None:
+                return
+
+            self.playwright, self.browser = await self._acquire_browser()
 
             # Create context with realistic browser settings
-            cookies = self.auth_manager.get_cookies()
-            cookie_list = []
+            if self.cdp_endpoint and self.browser.contexts:
+                # Reuse the shared browser's default context
+                self.context = self.browser.contexts[0]
+                self._owns_context = False
+            else:
+                self.context = await self.browser.new_context(
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
+                    locale='el-GR',
+                    timezone_id='Europe/Athens',
+                    permissions=[],
+                    has_touch=False,
+                    is_mobile=False,
+                    device_scale_factor=1,
+                    java_script_enabled=True,
+                    # Restore cookies and local storage saved by a previous run
+                    storage_state=(
+                        self.storage_state_path if os.path.exists(self.storage_state_path) else None
+                    ),
+                )
 
+            # Session cookies are shared with the curl_cffi client through the auth
+            # manager and may be newer than the saved storage state
+            setup = []
+            cookies = self.auth_manager.get_cookies()
             if cookies:
-                for name, value in cookies.items():
-                    cookie_list.append({
-                        "name": name,
-                        "value": value,
-                        "domain": ".skroutz.gr",
-                        "path": "/",
-                    })
-
-            self.context = await self.browser.new_context(
-                viewport={'width': 1920, 'height': 1080},
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36',
-                locale='el-GR',
-                timezone_id='Europe/Athens',
-                permissions=[],
-                has_touch=False,
-                is_mobile=False,
-                device_scale_factor=1,
-                java_script_enabled=True,
-            )
+                setup.append(self.context.add_cookies([
+                    {"name": name, "value": value, "domain": ".skroutz.gr", "path": "/"}
+                    for name, value in cookies.items()
+                ]))
 
-            # Add cookies if available
-            if cookie_list:
-                await self.context.add_cookies(cookie_list)
-
-            # Add comprehensive anti-detection scripts
-            await self.context.add_init_script("""
-                // Override the navigator.webdriver property
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined,
-                    configurable: true
-                });
-
-                // Remove automation indicators
-                delete navigator.__proto__.webdriver;
-
-                // Override navigator.plugins to make it realistic
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [
-                        {
-                            0: {type: "application/x-google-chrome-pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "internal-pdf-viewer",
-                            length: 1,
-                            name: "Chrome PDF Plugin"
-                        },
-                        {
-                            0: {type: "application/pdf", suffixes: "pdf", description: "Portable Document Format"},
-                            description: "Portable Document Format",
-                            filename: "mhjfbmdgcfjbbpaeojofohoefgiehjai",
-                            length: 1,
-                            name: "Chrome PDF Viewer"
-                        },
-                        {
-                            0: {type: "application/x-nacl", suffixes: "", description: "Native Client Executable"},
-                            1: {type: "application/x-pnacl", suffixes: "", description: "Portable Native Client Executable"},
-                            description: "",
-                            filename: "internal-nacl-plugin",
-                            length: 2,
-                            name: "Native Client"
-                        }
-                    ]
-                });
-
-                // Override navigator.languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['el-GR', 'el', 'en-US', 'en']
-                });
-
-                // Override Chrome runtime
-                window.chrome = {
-                    runtime: {},
-                    loadTimes: function() {},
-                    csi: function() {},
-                    app: {}
-                };
+            # Add comprehensive anti-detection scripts; a shared browser's default
+            # context was set up by its owner and already carries them
+            if self._owns_context:
+                setup.append(self.context.add_init_script(_STEALTH_JS))
 
-                // Override permissions API
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-
-                // Add missing properties
-                Object.defineProperty(navigator, 'maxTouchPoints', {
-                    get: () => 0
-                });
-
-                Object.defineProperty(navigator, 'vendor', {
-                    get: () => 'Google Inc.'
-                });
-
-                // Mock battery API
-                Object.defineProperty(navigator, 'getBattery', {
-                    value: () => Promise.resolve({
-                        charging: true,
-                        chargingTime: 0,
-                        dischargingTime: Infinity,
-                        level: 1
-                    })
-                });
-
-                // Prevent detection via connection
-                Object.defineProperty(navigator, 'connection', {
-                    get: () => ({
-                        effectiveType: '4g',
-                        rtt: 100,
-                        downlink: 10,
-                        saveData: false
-                    })
-                });
-
-                // Override mediaDevices
-                if (navigator.mediaDevices && navigator.mediaDevices.enumerateDevices) {
-                    const originalEnumerateDevices = navigator.mediaDevices.enumerateDevices.bind(navigator.mediaDevices);
-                    navigator.mediaDevices.enumerateDevices = () => {
-                        return originalEnumerateDevices().then(devices => {
-                            return devices.map((device, index) => {
-                                return {
-                                    deviceId: `device-${index}`,
-                                    groupId: `group-${index}`,
-                                    kind: device.kind,
-                                    label: ''
-                                };
-                            });
-                        });
-                    };
-                }
-
-                // Canvas fingerprinting protection
-                const originalToDataURL = HTMLCanvasElement.prototype.toDataURL;
-                HTMLCanvasElement.prototype.toDataURL = function(type) {
-                    if (type === 'image/png' && this.width === 16 && this.height === 16) {
-                        return 'data:image/png;base64,iVBORw0KGgoAAAANSUhEUgAAAAEAAAABCAYAAAAfFcSJAAAADUlEQVR42mNk+M9QDwADhgGAWjR9awAAAABJRU5ErkJggg==';
-                    }
-                    return originalToDataURL.apply(this, arguments);
-                };
+            # Both are independent, but must finish before the first page is opened
+            await asyncio.gather(*setup)
 
-                // WebGL fingerprinting protection
-                const getParameter = WebGLRenderingContext.prototype.getParameter;
-                WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                    if (parameter === 37445) {
-                        return 'Intel Inc.';
-                    }
-                    if (parameter === 37446) {
-                        return 'Intel Iris OpenGL Engine';
-                    }
-                    return getParameter.call(this, parameter);
-                };
+            self.page = await self._new_stealth_page()
+
+    @classmethod
+    def _shared_state_lock(cls) -> asyncio.Lock:
+        """
+        Return the lock guarding the shared browsers for the running event loop.
 
-                // Hide automation via Notification
-                const originalPermissions = Notification.permission;
-                Object.defineProperty(Notification, 'permission', {
-                    get: () => originalPermissions === 'denied' ? 'default' : originalPermissions
-                });
-            """)
+        The driver and browsers started by an earlier loop (e.g. a previous asyncio.run)
+        can neither be used nor closed from another one, so they are dropped.
+        """
+        loop = asyncio.get_running_loop()
+        if cls._shared_loop is not loop:
+            cls._shared_loop = loop
+            cls._shared_lock = asyncio.Lock()
+            cls._shared_playwright = None
+            cls._shared_browsers = {}
+            cls._shared_refcounts = {}
+        return cls._shared_lock
+
+    async def _acquire_browser(self) -> tuple[Playwright, Browser]:
+        """Get the process-wide browser for this client's settings, starting it on first use."""
+        cls = SkroutzClientPlaywright
+        key = (self.cdp_endpoint, self.headless)
+        async with cls._shared_state_lock():
+            if cls._shared_playwright is None:
+                cls._shared_playwright = await async_playwright().start()
+            browser = cls._shared_browsers.get(key)
+            if browser is None or not browser.is_connected():
+                browser = await self._launch_browser(cls._shared_playwright)
+                cls._shared_browsers[key] = browser
+            cls._shared_refcounts[key] = cls._shared_refcounts.get(key, 0) + 1
+            self._browser_loop = cls._shared_loop
+            return cls._shared_playwright, browser
+
+    async def _release_browser(self) -> None:
+        """Drop this client's reference to the shared browser, stopping it with the last one."""
+        cls = SkroutzClientPlaywright
+        key = (self.cdp_endpoint, self.headless)
+        self.playwright = None
+        self.browser = None
+        async with cls._shared_state_lock():
+            if self._browser_loop is not cls._shared_loop:
+                # Acquired on an earlier event loop whose browsers were already dropped
+                return
+            cls._shared_refcounts[key] -= 1
+            if cls._shared_refcounts[key]:
+                return
+            del cls._shared_refcounts[key]
+            try:
+                # For a CDP browser this only disconnects from it
+                await cls._shared_browsers.pop(key).close()
+                if not cls._shared_browsers:
+                    await cls._shared_playwright.stop()
+            except Exception as e:
+                logger.warning(f"Error stopping browser: {e}")
+            finally:
+                if not cls._shared_browsers:
+                    cls._shared_playwright = None
+
+    async def _launch_browser(self, playwright: Playwright) -> Browser:
+        """Launch Chromium, or attach to the configured CDP endpoint."""
+        if self.cdp_endpoint:
+            # Attach to a long-lived shared browser, skipping the Chromium cold start
+            logger.info(f"Connecting to shared browser at {self.cdp_endpoint}")
+            return await playwright.chromium.connect_over_cdp(self.cdp_endpoint)
+
+        # Launch with comprehensive anti-detection arguments
+        launch_options: dict[str, Any] = {
+            "headless": self.headless,
+            # The sandbox cannot start as root (e.g. in containers)
+            "chromium_sandbox": hasattr(os, "geteuid") and os.geteuid() != 0,
+            "args": list(_LAUNCH_ARGS),
+        }
+        try:
+            # The "chromium" channel runs the new headless mode, which keeps GPU
+            # rasterization and is harder to fingerprint than the headless shell
+            return await playwright.chromium.launch(channel="chromium", **launch_options)
+        except PlaywrightError as e:
+            # Playwright releases before 1.49 don't know the "chromium" channel
+            logger.warning("Could not launch the chromium channel, using the default one: %s", e)
+            return await playwright.chromium.launch(**launch_options)
+
+    async def _new_stealth_page(self) -> Page:
+        """Open a new page in the browser context with playwright-stealth applied if needed."""
+        page = await self.context.new_page()
+
+        # Apply playwright-stealth if available, unless the shared context is already stealthed
+        if STEALTH_AVAILABLE and self._owns_context:
+            try:
+                await stealth_async(page)
+                logger.info("✓ Playwright-stealth applied")
+            except Exception as e:
+                logger.warning(f"Could not apply playwright-stealth: {e}")
 
-            self.page = await self.context.new_page()
+        return page
 
-            # Apply playwright-stealth if available
-            if STEALTH_AVAILABLE:
-                try:
-                    await stealth_async(self.page)
-                    logger.info("✓ Playwright-stealth applied")
-                except Exception as e:
-                    logger.warning(f"Could not apply playwright-stealth: {e}")
-
-    async def _save_cookies(self) -> None:
-        """Save current cookies to auth manager."""
-        if self.context:
-            cookies = await self.context.cookies()
-            cookie_dict = {cookie["name"]: cookie["value"] for cookie in cookies}
-            if cookie_dict:
-                self.auth_manager.save_session(
-                    cookies=cookie_dict,
-                    user_email=self.auth_manager.session.user_email
-                )
+    async def init_page_pool(self, size: int = 4) -> None:
+        """
+        Create a pool of pages sharing the browser context, used by pooled_page().
+
+        Args:
+            size: Number of pages in the pool
+        """
+        async with self._pool_lock:
+            if self._page_pool is not None:
+                return
+
+            await self._start_browser()
+            pool: asyncio.Queue[Page] = asyncio.Queue()
+            for _ in range(size):
+                pool.put_nowait(await self._new_stealth_page())
+            self._page_pool = pool
+            logger.info(f"Page pool initialized with {size} pages")
+
+    @asynccontextmanager
+    async def pooled_page(self) -> AsyncIterator[Page]:
+        """
+        Borrow a page from the pool, waiting for one to be free.
 
-    async def _wait_for_cloudflare(self, timeout: int = 30000) -> bool:
+        Falls back to the main page when no pool was initialized.
+        """
+        if self._page_pool is None:
+            await self._start_browser()
+            yield self.page
+            return
+
+        page = await self._page_pool.get()
+        try:
+            yield page
+        finally:
+            self._page_pool.put_nowait(page)
+
+    async def _save_cookies(self, user_email: Optional[str] = None) -> None:
+        """
+        Save the browser storage state to disk and the current cookies to auth manager.
+
+        Args:
+            user_email: Email to store with the session (defaults to the current one)
+        """
+        if not self.context:
+            return
+
+        # Most cart actions don't rotate cookies, so only rewrite files that would change.
+        # Serialization and disk writes run off the event loop.
+        async with self._save_lock:
+            state = await self.context.storage_state()
+            if state != self._saved_storage_state:
+                await asyncio.to_thread(_write_storage_state, self.storage_state_path, state)
+                self._saved_storage_state = state
+
+            cookie_dict = {cookie["name"]: cookie["value"] for cookie in state["cookies"]}
+            if cookie_dict or user_email:
+                session = self.auth_manager.session
+                cookies = cookie_dict or session.cookies
+                email = user_email or session.user_email
+                if (cookies, email, True) != (session.cookies, session.user_email, session.is_authenticated):
+                    await asyncio.to_thread(
+                        self.auth_manager.save_session, cookies=cookies, user_email=email
+                    )
+
+    async def _wait_for_cloudflare(self, timeout: int = 30000, page: Optional[Page] = None) -> bool:
         """
         Wait for Cloudflare challenge to complete.
 
         Args:
             timeout: Maximum time to wait in milliseconds
+            page: Page to check (defaults to the main page)
 
         Returns:
             True if challenge passed, False otherwise
         """
         logger.info("Checking for Cloudflare challenge...")
+        page = page or self.page
 
         try:
-            # Wait a bit for page to settle
-            await asyncio.sleep(2)
-
-            # Check if we're on a Cloudflare challenge page
-            content = await self.page.content()
+            # Challenge pages are served as the document itself, so it only has to be parsed
+            await page.wait_for_load_state("domcontentloaded")
 
-            # Look for Cloudflare indicators
-            cf_indicators = [
-                'challenge-platform',
-                'cf-browser-verification',
-                'cf-challenge',
-                'cf-turnstile',
-                'Just a moment',
-                'Checking your browser',
-                'Επαληθεύστε ότι είστε άνθρωπος',
-            ]
-
-            is_cloudflare = any(indicator in content for indicator in cf_indicators)
+            # Check once if we're on a Cloudflare challenge page
+            is_cloudflare = _CF_CHALLENGE_RE.search(await page.content()) is not None
 
             if is_cloudflare:
                 logger.info("Cloudflare challenge detected, attempting to solve...")
 
-                # Try to find and click the Turnstile checkbox
-                turnstile_selectors = [
-                    'iframe[src*="cloudflare"]',
-                    'iframe[src*="turnstile"]',
-                    'input[type="checkbox"]',
-                    '#cf-turnstile',
-                ]
-
-                # Look for Cloudflare iframe
-                for selector in turnstile_selectors:
-                    try:
-                        if 'iframe' in selector:
-                            # Handle iframe-based challenge
-                            iframe_element = await self.page.query_selector(selector)
-                            if iframe_element:
-                                logger.info(f"Found Cloudflare iframe: {selector}")
-                                # Switch to iframe and try to find checkbox
-                                frame = await iframe_element.content_frame()
-                                if frame:
-                                    checkbox = await frame.query_selector('input[type="checkbox"]')
-                                    if checkbox:
-                                        logger.info("Clicking Turnstile checkbox...")
-                                        await checkbox.click()
-                                        await asyncio.sleep(2)
-                                        break
-                        else:
-                            # Direct checkbox
-                            checkbox = await self.page.query_selector(selector)
-                            if checkbox:
-                                logger.info(f"Found checkbox: {selector}")
-                                await checkbox.click()
-                                await asyncio.sleep(2)
-                                break
-                    except Exception as e:
-                        logger.debug(f"Selector {selector} failed: {e}")
-                        continue
+                # Try to find and click the Turnstile checkbox, inside its iframe or directly
+                try:
+                    checkbox = page.frame_locator(_TURNSTILE_IFRAME_SELECTOR).first.locator(
+                        'input[type="checkbox"]'
+                    ).first
+                    if not await checkbox.count():
+                        checkbox = page.locator(_TURNSTILE_CHECKBOX_SELECTOR).first
+                    if await checkbox.count():
+                        logger.info("Clicking Turnstile checkbox...")
+                        await checkbox.click()
+                except Exception as e:
+                    logger.debug(f"Turnstile checkbox click failed: {e}")
 
                 # Wait for challenge to complete (URL changes or challenge elements disappear)
-                max_wait = timeout / 1000  # Convert to seconds
-                waited = 0
-                check_interval = 1  # Check every second
-
-                while waited < max_wait:
-                    await asyncio.sleep(check_interval)
-                    waited += check_interval
-
-                    content = await self.page.content()
-                    if not any(indicator in content for indicator in cf_indicators):
-                        logger.info("✓ Cloudflare challenge completed")
-                        await asyncio.sleep(1)  # Small delay after completion
-                        return True
-
-                    # Also check URL - if it changed, challenge might be complete
-                    current_url = self.page.url
-                    if 'cdn-cgi/challenge' not in current_url:
-                        logger.info("✓ Cloudflare challenge passed (URL changed)")
-                        await asyncio.sleep(1)
-                        return True
+                try:
+                    await page.wait_for_function(_CF_CLEARED_JS, timeout=timeout, polling=500)
+                    logger.info("✓ Cloudflare challenge completed")
+                    await page.wait_for_load_state("domcontentloaded")
+                    return True
+                except PlaywrightTimeoutError:
+                    pass
 
                 logger.warning("Cloudflare challenge timeout")
                 return False
@@ -363,10 +933,161 @@ class SkroutzClientPlaywright:
             logger.error(f"Error waiting for Cloudflare: {e}")
             return False
 
+    def _debug_screenshot(self, name: str) -> None:
+        """
+        Save a screenshot of the main page to /tmp/<name>.jpg in the background.
+
+        Only enabled when SKROUTZ_DEBUG_SCREENSHOTS=1, so failure paths return
+        without waiting on the capture.
+
+        Args:
+            name: File name without directory or extension
+        """
+        if not _DEBUG_SCREENSHOTS or self.page is None:
+            return
+
+        path = f"/tmp/{name}.jpg"
+
+        def _done(task: asyncio.Task) -> None:
+            self._background_tasks.discard(task)
+            if task.cancelled() or task.exception() is not None:
+                logger.debug(f"Could not save screenshot to {path}")
+            else:
+                logger.info(f"Screenshot saved to {path}")
+
+        task = asyncio.create_task(self.page.screenshot(path=path, type="jpeg", quality=40))
+        self._background_tasks.add(task)
+        task.add_done_callback(_done)
+
+    async def _wait_for_content(
+        self, selector: str, timeout: int = 3000, page: Optional[Page] = None
+    ) -> bool:
+        """
+        Wait for an element matching selector to be attached to the page.
+
+        Returns:
+            False if it did not show up within timeout (the page can still be parsed as is)
+        """
+        try:
+            await (page or self.page).wait_for_selector(selector, state="attached", timeout=timeout)
+            return True
+        except PlaywrightTimeoutError:
+            logger.debug("No %s element after %dms", selector, timeout)
+            return False
+
+    async def _wait_for_network_idle(self, timeout: int = 5000) -> None:
+        """Wait for the requests triggered by a cart action to settle, continuing on timeout."""
+        try:
+            await self.page.wait_for_load_state("networkidle", timeout=timeout)
+        except PlaywrightTimeoutError:
+            logger.debug("Network still busy after %dms, continuing", timeout)
+
     async def _human_delay(self, min_ms: int = 100, max_ms: int = 500) -> None:
         """Add a random delay to simulate human behavior."""
-        delay = random.randint(min_ms, max_ms) / 1000
-        await asyncio.sleep(delay)
+        await asyncio.sleep((min_ms + random.random() * (max_ms - min_ms)) / 1000)
+
+    async def _submit_login_form_in_page(self, credentials: AuthCredentials) -> bool:
+        """
+        Fill and submit the login form with one in-page script per form step.
+
+        Args:
+            credentials: User credentials (email and password)
+
+        Returns:
+            True if the form was submitted, False if the locator flow should be used
+        """
+        form = {
+            "email": credentials.email,
+            "password": credentials.password,
+            "emailSelector": ', '.join(_EMAIL_INPUTS),
+            "passwordSelector": ', '.join(_PASSWORD_INPUTS),
+            "submitSelector": ', '.join(_SUBMIT_BUTTONS),
+        }
+        try:
+            step = await self.page.evaluate(_LOGIN_FORM_JS, form)
+            if step == "email":
+                # The password step is on the document the email step navigates to
+                logger.info("Submitted email, waiting for password field to appear...")
+                await self.page.locator(_PASSWORD_INPUT_SELECTOR).first.wait_for(
+                    state="visible", timeout=15000
+                )
+                step = await self.page.evaluate(_LOGIN_FORM_JS, form)
+        except Exception as e:
+            logger.debug("In-page login failed: %s", e)
+            return False
+        return step == "password"
+
+    async def _submit_login_form(self, credentials: AuthCredentials) -> bool:
+        """
+        Fill and submit the login form step by step through locators.
+
+        Starts from whichever step the page shows, so a login whose email step was
+        already submitted continues on the password page.
+
+        Args:
+            credentials: User credentials (email and password)
+
+        Returns:
+            True if the form was submitted, False if a field could not be found
+        """
+        login_field = self.page.locator(f"{_EMAIL_INPUT_SELECTOR}, {_PASSWORD_INPUT_SELECTOR}").first
+        try:
+            await login_field.wait_for(state="visible", timeout=15000)
+        except PlaywrightTimeoutError:
+            logger.error("Could not find email or password input field")
+            # Save screenshot for debugging
+            self._debug_screenshot("skroutz_login_fail_email")
+            return False
+
+        password_input = self.page.locator(_PASSWORD_INPUT_SELECTOR).first
+        if await password_input.count():
+            logger.info("Password field already visible, skipping the email step")
+        else:
+            email_input = self.page.locator(_EMAIL_INPUT_SELECTOR).first
+            await self._human_delay(300, 800)
+            # fill() focuses the field itself, so no separate click round trip
+            await email_input.fill(credentials.email)
+            logger.info("Email filled")
+
+            # Click continue button (two-step login flow)
+            logger.info("Looking for continue button...")
+            continue_button = self.page.get_by_role("button", name=_CONTINUE_BUTTON_NAME).or_(
+                self.page.locator(_SUBMIT_SELECTOR)
+            ).first
+            if await continue_button.count():
+                await self._human_delay(500, 1000)
+                await continue_button.click()
+                logger.info("Clicked continue, waiting for password field to appear...")
+            else:
+                logger.info("No continue button found, assuming password field is already visible")
+
+        # Fill password field; continuing may have navigated to the password page
+        try:
+            await password_input.wait_for(state="visible", timeout=15000)
+        except PlaywrightTimeoutError:
+            logger.error("Could not find password input field")
+            self._debug_screenshot("skroutz_login_fail_password")
+            return False
+
+        await self._human_delay(300, 800)
+        await password_input.fill(credentials.password)
+        logger.info("Password filled")
+
+        # Submit the form
+        logger.info("Submitting login form...")
+        submit_button = self.page.locator(_SUBMIT_SELECTOR).or_(
+            self.page.get_by_role("button", name=_LOGIN_BUTTON_NAME)
+        ).first
+        if await submit_button.count():
+            await self._human_delay(500, 1000)
+            await submit_button.click()
+            logger.info("Clicked submit")
+        else:
+            # Try pressing Enter as fallback
+            logger.info("Trying Enter key to submit...")
+            await self.page.keyboard.press('Enter')
+
+        return True
 
     async def login(self, credentials: AuthCredentials) -> bool:
         """
@@ -385,148 +1106,21 @@ class SkroutzClientPlaywright:
 
             # Navigate to login page
             logger.info("Navigating to login page...")
-            await self.page.goto(f"{self.BASE_URL}/login", wait_until="domcontentloaded")
+            await self.page.goto(f"{self.BASE_URL}/login", wait_until="commit")
 
             # Wait for Cloudflare challenge
             if not await self._wait_for_cloudflare():
                 logger.error("Failed to bypass Cloudflare challenge")
                 return False
 
-            # Additional wait for page to fully load
-            await asyncio.sleep(2)
-
-            # Fill in login form
+            # Fill in login form in one in-page call, falling back to locators
             logger.info("Filling in login credentials...")
 
-            # Try different possible selectors for email/username field
-            email_selectors = [
-                'input[name="username"]',
-                'input[name="email"]',
-                'input[type="email"]',
-                'input[id*="email"]',
-                'input[id*="username"]',
-                'input[placeholder*="email"]',
-            ]
-
-            email_filled = False
-            for selector in email_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        await self._human_delay(200, 500)
-                        await element.click()
-                        await self._human_delay(100, 300)
-                        await element.fill(credentials.email)
-                        logger.info(f"Email filled using selector: {selector}")
-                        email_filled = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-
-            if not email_filled:
-                logger.error("Could not find email input field")
-                # Save screenshot for debugging
-                try:
-                    await self.page.screenshot(path="/tmp/skroutz_login_fail_email.png")
-                    logger.info("Screenshot saved to /tmp/skroutz_login_fail_email.png")
-                except:
-                    pass
-                return False
-
-            # Click continue button (two-step login flow)
-            logger.info("Looking for continue button...")
-            continue_selectors = [
-                'button:has-text("Συνέχεια")',
-                'button:has-text("Continue")',
-                'button[type="submit"]',
-                'input[type="submit"]',
-            ]
-
-            continue_clicked = False
-            for selector in continue_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        await self._human_delay(500, 1000)
-                        await element.click()
-                        logger.info(f"Clicked continue using selector: {selector}")
-                        continue_clicked = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Continue selector {selector} failed: {e}")
-                    continue
-
-            if continue_clicked:
-                # Wait for password field to appear
-                logger.info("Waiting for password field to appear...")
-                await asyncio.sleep(2)
-            else:
-                logger.info("No continue button found, assuming password field is already visible")
-
-            # Fill password field
-            password_selectors = [
-                'input[name="password"]',
-                'input[type="password"]',
-                'input[id*="password"]',
-                'input[placeholder*="password"]',
-                'input[placeholder*="κωδικός"]',
-            ]
-
-            password_filled = False
-            for selector in password_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        await self._human_delay(200, 500)
-                        await element.click()
-                        await self._human_delay(100, 300)
-                        await element.fill(credentials.password)
-                        logger.info(f"Password filled using selector: {selector}")
-                        password_filled = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
-
-            if not password_filled:
-                logger.error("Could not find password input field")
-                try:
-                    await self.page.screenshot(path="/tmp/skroutz_login_fail_password.png")
-                    logger.info("Screenshot saved to /tmp/skroutz_login_fail_password.png")
-                except:
-                    pass
+            if await self._submit_login_form_in_page(credentials):
+                logger.info("Submitted login form")
+            elif not await self._submit_login_form(credentials):
                 return False
 
-            # Submit the form
-            logger.info("Submitting login form...")
-            submit_selectors = [
-                'button[type="submit"]',
-                'input[type="submit"]',
-                'button:has-text("Σύνδεση")',
-                'button:has-text("Login")',
-                'button:has-text("Είσοδος")',
-            ]
-
-            submitted = False
-            for selector in submit_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        await self._human_delay(500, 1000)
-                        await element.click()
-                        logger.info(f"Clicked submit using selector: {selector}")
-                        submitted = True
-                        break
-                except Exception as e:
-                    logger.debug(f"Submit selector {selector} failed: {e}")
-                    continue
-
-            if not submitted:
-                # Try pressing Enter as fallback
-                logger.info("Trying Enter key to submit...")
-                await self.page.keyboard.press('Enter')
-
             # Wait for navigation
             await asyncio.sleep(3)
 
@@ -534,61 +1128,50 @@ class SkroutzClientPlaywright:
             current_url = self.page.url
             logger.info(f"Current URL after login: {current_url}")
 
-            # Check for common success indicators
-            content = await self.page.content()
+            # Check for common success indicators, evaluating the page ones in the browser
             is_logged_in = (
                 "/login" not in current_url or
-                await self.page.query_selector('a[href*="logout"]') is not None or
-                await self.page.query_selector('a[href*="account"]') is not None or
-                "logout" in content.lower() or
-                "αποσύνδεση" in content.lower()
+                await self.page.evaluate(_LOGGED_IN_JS, _LOGGED_IN_RE.pattern)
             )
 
             if is_logged_in:
                 logger.info("✓ Login successful!")
 
-                # Save cookies
-                await self._save_cookies()
-                self.auth_manager.session.user_email = credentials.email
-                self.auth_manager.session.is_authenticated = True
-                self.auth_manager._save_session()
+                # Save cookies and the logged in email in a single session write
+                await self._save_cookies(user_email=credentials.email)
 
                 return True
             else:
                 logger.error("Login failed - not redirected properly")
 
                 # Check for error messages
-                error_elem = await self.page.query_selector('.error, .alert, .message, .error-message')
-                if error_elem:
+                error_elem = self.page.locator(_LOGIN_ERROR_SELECTOR).first
+                if await error_elem.count():
                     error_text = await error_elem.inner_text()
                     logger.error(f"Error message: {error_text}")
 
                 # Save screenshot for debugging
-                try:
-                    await self.page.screenshot(path="/tmp/skroutz_login_fail.png")
-                    logger.info("Screenshot saved to /tmp/skroutz_login_fail.png")
-                except:
-                    pass
+                self._debug_screenshot("skroutz_login_fail")
 
                 return False
 
         except Exception as e:
             logger.error(f"Login error: {e}", exc_info=True)
-            try:
-                await self.page.screenshot(path="/tmp/skroutz_login_error.png")
-            except:
-                pass
+            self._debug_screenshot("skroutz_login_error")
             return False
 
     async def logout(self) -> None:
         """Logout from skroutz.gr and clear session."""
         try:
             if self.page and self.auth_manager.is_authenticated():
-                await self.page.goto(f"{self.BASE_URL}/logout", wait_until="domcontentloaded")
+                await self.page.goto(f"{self.BASE_URL}/logout", wait_until="commit")
         except Exception:
             pass
 
         self.auth_manager.clear_session()
+        if os.path.exists(self.storage_state_path):
+            os.remove(self.storage_state_path)
+        self._saved_storage_state = None
         logger.info("Logged out successfully")
 
     async def search_products(self, query: str) -> list[Product]:
@@ -606,21 +1189,30 @@ class SkroutzClientPlaywright:
         try:
             await self._start_browser()
 
-            # Navigate to search page
-            await self.page.goto(f"{self.BASE_URL}/search?keyphrase={query}", wait_until="domcontentloaded")
+            # Only the HTML is parsed, so skip images, fonts, media and stylesheets
+            await self.page.route("**/*", _block_static_resources)
+            try:
+                # Navigate to search page
+                await self.page.goto(f"{self.BASE_URL}/search?keyphrase={query}", wait_until="commit")
 
-            # Wait for Cloudflare
-            if not await self._wait_for_cloudflare():
-                logger.error("Failed to bypass Cloudflare challenge")
-                return []
+                # Wait for Cloudflare
+                if not await self._wait_for_cloudflare():
+                    logger.error("Failed to bypass Cloudflare challenge")
+                    return []
 
-            await asyncio.sleep(2)
+                # Wait for the product cards (or the no-results message) rather than a
+                # fixed delay; pages without either still need the full document for
+                # the fallback parser
+                if not await self._wait_for_content(_SEARCH_DONE_SELECTOR):
+                    await self.page.wait_for_load_state("domcontentloaded")
 
-            # Parse products from page
-            products = await self._parse_products_from_page()
-            logger.info(f"Found {len(products)} products")
+                # Parse products from page
+                products = await self._parse_products_from_page()
+                logger.info(f"Found {len(products)} products")
 
-            return products
+                return products
+            finally:
+                await self.page.unroute("**/*", _block_static_resources)
 
         except Exception as e:
             logger.error(f"Search error: {e}", exc_info=True)
@@ -646,63 +1238,45 @@ class SkroutzClientPlaywright:
         try:
             await self._start_browser()
 
-            # Handle both full URLs and SKU IDs
+            # Handle both full URLs (query string dropped) and SKU IDs
             if product_url.startswith('http'):
-                # Full URL provided, use it
-                clean_url = product_url.split('?')[0] if '?' in product_url else product_url
-                logger.info(f"Navigating to full URL: {clean_url}")
-                await self.page.goto(clean_url, wait_until="domcontentloaded")
+                clean_url = product_url.partition('?')[0]
             else:
-                # SKU ID provided, construct URL
-                logger.info(f"Navigating to SKU: {product_url}")
-                await self.page.goto(f"{self.BASE_URL}/s/{product_url}", wait_until="domcontentloaded")
+                clean_url = f"{self.BASE_URL}/s/{product_url}"
+            logger.info(f"Navigating to product: {clean_url}")
+            await self.page.goto(clean_url, wait_until="commit")
 
             if not await self._wait_for_cloudflare():
                 logger.error("Cloudflare challenge failed")
                 return False
-            await asyncio.sleep(2)
 
             # Find and click add to cart button for "Αγορά μέσω Skroutz"
-            add_selectors = [
-                'button:has-text("Προσθήκη στο καλάθι")',
-                'button:has-text("Αγορά μέσω Skroutz")',
-                'button:has-text("Προσθήκη")',
-                'a:has-text("Προσθήκη στο καλάθι")',
-                'a:has-text("Αγορά μέσω Skroutz")',
-                'button[class*="add-to-cart"]',
-                'button[class*="add_to_cart"]',
-                'button[data-analytics*="cart"]',
-            ]
-
-            for selector in add_selectors:
-                try:
-                    element = await self.page.query_selector(selector)
-                    if element:
-                        logger.info(f"Found add to cart button with selector: {selector}")
-
-                        # Set quantity if needed
-                        qty_input = await self.page.query_selector('input[name="quantity"], input[type="number"]')
-                        if qty_input and quantity != 1:
-                            await qty_input.fill(str(quantity))
-                            await self._human_delay()
-
-                        await self._human_delay(300, 700)
-                        await element.click()
-                        await asyncio.sleep(3)
-
-                        await self._save_cookies()
-                        logger.info("ADD TO CART SUCCESS")
-                        return True
-                except Exception as e:
-                    logger.debug(f"Selector {selector} failed: {e}")
-                    continue
+            add_button = self.page.locator(_ADD_TO_CART_SELECTOR).first
+            try:
+                await add_button.wait_for(state="visible", timeout=15000)
+            except PlaywrightTimeoutError:
+                add_button = None
+
+            if add_button is not None:
+                logger.info("Found add to cart button")
+
+                # Set quantity if needed (the field is only looked up then); one
+                # pause covers both the quantity edit and the click
+                qty_input = self.page.locator(_QUANTITY_INPUT_SELECTOR).first
+                if quantity != 1 and await qty_input.count():
+                    await qty_input.fill(str(quantity))
+                    await self._human_delay(400, 1200)
+                else:
+                    await self._human_delay(300, 700)
+                await add_button.click()
+                await asyncio.sleep(3)
+
+                await self._save_cookies()
+                logger.info("ADD TO CART SUCCESS")
+                return True
 
             # Save screenshot for debugging
-            try:
-                await self.page.screenshot(path="/tmp/skroutz_add_to_cart_fail.png")
-                logger.info("Screenshot saved to /tmp/skroutz_add_to_cart_fail.png")
-            except:
-                pass
+            self._debug_screenshot("skroutz_add_to_cart_fail")
 
             logger.error("Could not find add to cart button")
             return False
@@ -723,21 +1297,21 @@ class SkroutzClientPlaywright:
             await self.page.goto(f"{self.BASE_URL}/cart", wait_until="domcontentloaded")
             if not await self._wait_for_cloudflare():
                 return False
-            await asyncio.sleep(1)
-
-            remove_buttons = await self.page.query_selector_all('button[class*="remove"], a[class*="remove"]')
+            # Only click the remove control of this product's row, never another product's
+            remove_selector = _remove_button_selector(product_id)
+            await self._wait_for_content(remove_selector)
+            remove_button = self.page.locator(remove_selector).first
+            if not await remove_button.count():
+                logger.warning("Could not find remove button for product %s", product_id)
+                return False
 
-            for button in remove_buttons:
-                await self._human_delay(200, 500)
-                await button.click()
-                await asyncio.sleep(2)
+            await self._human_delay(200, 500)
+            await remove_button.click()
+            await self._wait_for_network_idle()
 
-                await self._save_cookies()
-                logger.info("REMOVE FROM CART SUCCESS")
-                return True
-
-            logger.warning("Could not find remove button")
-            return False
+            await self._save_cookies()
+            logger.info("REMOVE FROM CART SUCCESS")
+            return True
 
         except Exception as e:
             logger.error(f"Remove from cart error: {e}", exc_info=True)
@@ -745,7 +1319,7 @@ class SkroutzClientPlaywright:
 
     async def update_cart_item_quantity(self, product_id: str, quantity: int) -> bool:
         """Update the quantity of a product in the shopping cart."""
-        logger.info(f"=== UPDATE CART: product_id={product_id}, new_quantity={quantity} ===")
+        logger.info("=== UPDATE CART: product_id=%s, new_quantity=%s ===", product_id, quantity)
 
         if not self.auth_manager.is_authenticated():
             raise Exception("Must be authenticated to modify cart")
@@ -755,27 +1329,28 @@ class SkroutzClientPlaywright:
             await self.page.goto(f"{self.BASE_URL}/cart", wait_until="domcontentloaded")
             if not await self._wait_for_cloudflare():
                 return False
-            await asyncio.sleep(1)
 
-            qty_inputs = await self.page.query_selector_all('input[name*="quantity"], input[type="number"]')
-
-            if qty_inputs:
-                await qty_inputs[0].fill(str(quantity))
-                await self._human_delay(300, 700)
+            if not await self._wait_for_content(_CART_QUANTITY_INPUT_SELECTOR, timeout=5000):
+                return False
 
-                update_button = await self.page.query_selector('button:has-text("Ενημέρωση"), button:has-text("Update")')
-                if update_button:
-                    await update_button.click()
-                    await asyncio.sleep(2)
+            await self.page.locator(_CART_QUANTITY_INPUT_SELECTOR).first.fill(str(quantity))
 
-                await self._save_cookies()
-                logger.info("UPDATE CART SUCCESS")
-                return True
+            # Look for the update button while the human delay runs; it is not waited
+            # for any longer than the delay itself
+            _, has_update_button = await asyncio.gather(
+                self._human_delay(300, 700),
+                self._wait_for_content(_UPDATE_BUTTON_SELECTOR, timeout=700),
+            )
+            if has_update_button:
+                await self.page.locator(_UPDATE_BUTTON_SELECTOR).first.click()
+                await self._wait_for_network_idle()
 
-            return False
+            await self._save_cookies()
+            logger.info("UPDATE CART SUCCESS")
+            return True
 
         except Exception as e:
-            logger.error(f"Update cart error: {e}", exc_info=True)
+            logger.error("Update cart error: %s", e, exc_info=True)
             return False
 
     async def get_cart(self) -> Cart:
@@ -790,15 +1365,15 @@ class SkroutzClientPlaywright:
             await self.page.goto(f"{self.BASE_URL}/cart", wait_until="domcontentloaded")
             if not await self._wait_for_cloudflare():
                 return Cart()
-            await asyncio.sleep(1)
+            await self._wait_for_content(_CART_CONTENT_SELECTOR)
 
             cart = await self._parse_cart_from_page()
-            logger.info(f"Cart: item_count={cart.item_count}, total={cart.total}")
+            logger.info("Cart: item_count=%s, total=%s", cart.item_count, cart.total)
 
             return cart
 
         except Exception as e:
-            logger.error(f"Get cart error: {e}", exc_info=True)
+            logger.error("Get cart error: %s", e, exc_info=True)
             return Cart()
 
     async def get_orders(self, include_history: bool = True) -> list[Order]:
@@ -813,10 +1388,10 @@ class SkroutzClientPlaywright:
             await self.page.goto(f"{self.BASE_URL}/account/orders", wait_until="domcontentloaded")
             if not await self._wait_for_cloudflare():
                 return []
-            await asyncio.sleep(1)
+            await self._wait_for_content(_ORDERS_CONTENT_SELECTOR)
 
             orders = await self._parse_orders_from_page()
-            logger.info(f"Found {len(orders)} orders")
+            logger.info("Found %d orders", len(orders))
 
             if not include_history:
                 orders = [
@@ -827,137 +1402,107 @@ class SkroutzClientPlaywright:
             return orders
 
         except Exception as e:
-            logger.error(f"Get orders error: {e}", exc_info=True)
+            logger.error("Get orders error: %s", e, exc_info=True)
             return []
 
-    async def get_order_details(self, order_id: str) -> Optional[Order]:
-        """Get detailed information for a specific order."""
-        logger.info(f"=== GET ORDER DETAILS: order_id={order_id} ===")
+    async def get_order_details(self, order_id: str, page: Optional[Page] = None) -> Optional[Order]:
+        """
+        Get detailed information for a specific order.
+
+        Args:
+            order_id: Order ID
+            page: Page to load the order on (defaults to the main page), so several
+                orders can be fetched concurrently on pages from pooled_page()
+
+        Returns:
+            Order object or None
+        """
+        logger.info("=== GET ORDER DETAILS: order_id=%s ===", order_id)
 
         if not self.auth_manager.is_authenticated():
             raise Exception("Must be authenticated to view orders")
 
         try:
             await self._start_browser()
-            await self.page.goto(f"{self.BASE_URL}/account/orders/{order_id}", wait_until="domcontentloaded")
-            if not await self._wait_for_cloudflare():
+            page = page or self.page
+            await page.goto(f"{self.BASE_URL}/account/orders/{order_id}", wait_until="domcontentloaded")
+            if not await self._wait_for_cloudflare(page=page):
                 return None
-            await asyncio.sleep(1)
+            await self._wait_for_content(_ORDER_DETAILS_CONTENT_SELECTOR, page=page)
 
-            order = await self._parse_order_details_from_page(order_id)
-            logger.info(f"Order details retrieved for {order_id}")
+            order = await self._parse_order_details_from_page(order_id, page)
+            logger.info("Order details retrieved for %s", order_id)
 
             return order
 
         except Exception as e:
-            logger.error(f"Get order details error: {e}", exc_info=True)
+            logger.error("Get order details error: %s", e, exc_info=True)
             return None
 
     # Helper methods for parsing
 
     async def _parse_products_from_page(self) -> list[Product]:
         """Parse products from current page, excluding sponsored/promoted items."""
-        from bs4 import BeautifulSoup
-
-        html = await self.page.content()
-        soup = BeautifulSoup(html, 'lxml')
-        products = []
+        if _DUMP_HTML:
+            html = await self.page.content()
+            await asyncio.to_thread(_write_debug_file, '/tmp/skroutz_search_results.html', html)
 
-        # Save HTML for debugging
+        # Extract the cards in the page so only their fields cross the CDP channel,
+        # parsing the serialized page if the evaluation fails
         try:
-            with open('/tmp/skroutz_search_results.html', 'w', encoding='utf-8') as f:
-                f.write(html)
-            logger.info("Saved search HTML to /tmp/skroutz_search_results.html")
-        except:
-            pass
-
-        # Prefer elements with data-skuid attribute
-        product_elements = soup.find_all('li', attrs={'data-skuid': True})
-        logger.info(f"Found {len(product_elements)} elements with data-skuid")
-
-        if not product_elements:
-            # Fallback to class-based parsing
-            product_elements = soup.find_all(['li', 'div'], class_=re.compile(r'product|item', re.I))
-            logger.info(f"Fallback found {len(product_elements)} product/item elements")
+            cards = await self.page.evaluate(_PRODUCT_CARDS_JS)
+            logger.info("Extracted %d product cards in page", len(cards))
+        except Exception as e:
+            logger.debug("In-page product extraction failed, parsing page HTML: %s", e)
+            cards = _product_cards_from_html(await self.page.content())
 
-        for elem in product_elements[:50]:
+        products = []
+        for card in cards:
             # Filter out sponsored/promoted products based on uBlock filters
-            classes = elem.get('class', [])
-            if isinstance(classes, str):
-                classes = [classes]
-
             # Skip labeled/sponsored products (uBlock filter: li.labeled-product.labeled-item)
-            if any(cls in classes for cls in ['labeled-product', 'labeled-item', 'product-ad']):
+            if not _AD_CLASSES.isdisjoint(card['classes'].split()):
                 continue
 
             # Skip if parent is a sponsored container (uBlock: .selected-product-cards)
-            parent = elem.parent
-            if parent:
-                parent_classes = parent.get('class', [])
-                if isinstance(parent_classes, str):
-                    parent_classes = [parent_classes]
-                if any(cls in parent_classes for cls in ['selected-product-cards', 'product-ad']):
-                    continue
+            if not _AD_PARENT_CLASSES.isdisjoint(card['parentClasses'].split()):
+                continue
 
             # Skip if has sponsorship/ad attributes
-            if elem.get('data-ad') or elem.get('data-sponsored'):
+            if card['ad'] or card['sponsored']:
                 continue
 
             try:
-                name_elem = elem.find(['a', 'h2', 'h3', 'h4'])
-                link_elem = elem.find('a', href=True)
+                name = card['name']
+                href = card['href']
 
-                if not name_elem or not link_elem:
+                if name is None or href is None:
                     continue
 
-                name = name_elem.get_text(strip=True)
-                href = link_elem.get('href', '')
-
                 # Extract SKU ID
-                product_id = elem.get('data-skuid', '')
+                product_id = card['skuid']
                 if not product_id:
-                    id_match = re.search(r'/s/(\d+)', href)
+                    id_match = _SKU_PATH_RE.search(href)
                     if id_match:
                         product_id = id_match.group(1)
 
                 # Find price with multiple strategies
                 price = Decimal("0")
-                price_elem = elem.find(['span', 'div', 'strong'], class_=re.compile(r'price', re.I))
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    price_match = re.search(r'([\d.,]+)\s*€', price_text)
+                price_text = card['priceText']
+                if price_text is not None:
+                    price_match = _PRICE_EURO_RE.search(price_text)
                     if price_match:
-                        price_str = price_match.group(1).replace('.', '').replace(',', '.')
-                        try:
-                            price = Decimal(price_str)
-                        except:
-                            pass
+                        price = _price_to_decimal(price_match.group(1))
 
                 # Fallback: search all text for price
                 if price == Decimal("0"):
-                    all_text = elem.get_text()
-                    price_matches = re.findall(r'([\d.,]+)\s*€', all_text)
-                    for match in price_matches:
-                        try:
-                            price_str = match.replace('.', '').replace(',', '.')
-                            test_price = Decimal(price_str)
-                            if test_price > 0:
-                                price = test_price
-                                break
-                        except:
-                            continue
+                    for match in _PRICE_EURO_RE.findall(card['text']):
+                        test_price = _price_to_decimal(match)
+                        if test_price > 0:
+                            price = test_price
+                            break
 
                 # Check availability
-                available = True
-                availability_text = elem.get_text().lower()
-                if any(phrase in availability_text for phrase in ['εξαντλημένο', 'out of stock', 'μη διαθέσιμο']):
-                    available = False
-
-                # Find image
-                image_elem = elem.find('img')
-                image_url = image_elem.get('src') if image_elem else None
-                if not image_url and image_elem:
-                    image_url = image_elem.get('data-src')
+                available = _UNAVAILABLE_RE.search(card['text']) is None
 
                 # Build full URL
                 full_url = None
@@ -973,51 +1518,51 @@ class SkroutzClientPlaywright:
                         name=name,
                         price=price,
                         available=available,
-                        image_url=image_url,
+                        image_url=card['image'],
                         url=full_url,
                     )
                     products.append(product)
 
             except Exception as e:
-                logger.warning(f"Failed to parse product: {e}")
+                logger.warning("Failed to parse product: %s", e)
                 continue
 
         return products
 
     async def _parse_cart_from_page(self) -> Cart:
         """Parse cart from current page."""
-        from bs4 import BeautifulSoup
-
         html = await self.page.content()
-        soup = BeautifulSoup(html, 'lxml')
+        root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
         items = []
         total = Decimal("0")
+        if root is None:
+            return Cart(items=items, total=total, item_count=0)
 
-        cart_items = soup.find_all(['div', 'tr'], class_=re.compile(r'cart.*item', re.I))
+        cart_items = _CART_ITEMS_XPATH(root)
 
         for item_elem in cart_items:
             try:
-                name_elem = item_elem.find(['a', 'span', 'h3'])
-                price_elem = item_elem.find(['span', 'div'], class_=re.compile(r'price', re.I))
-                qty_elem = item_elem.find(['input', 'span'], attrs={'name': re.compile(r'quantity', re.I)})
+                name_elem = _first(_CART_NAME_XPATH(item_elem))
+                price_elem = _first(_CART_PRICE_XPATH(item_elem))
+                qty_elem = _first(_CART_QUANTITY_XPATH(item_elem))
 
-                if not name_elem:
+                if name_elem is None:
                     continue
 
-                name = name_elem.get_text(strip=True)
+                name = _element_text(name_elem)
                 quantity = 1
                 price = Decimal("0")
 
-                if qty_elem:
-                    qty_text = qty_elem.get('value') or qty_elem.get_text(strip=True)
+                if qty_elem is not None:
+                    qty_text = qty_elem.get('value') or _element_text(qty_elem)
                     try:
                         quantity = int(qty_text)
-                    except:
+                    except ValueError:
                         pass
 
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    price_match = re.search(r'(\d+[.,]\d+)', price_text.replace('.', '').replace(',', '.'))
+                if price_elem is not None:
+                    price_text = _element_text(price_elem)
+                    price_match = _DECIMAL_RE.search(price_text.translate(_PRICE_TRANSLATE))
                     if price_match:
                         price = Decimal(price_match.group(1))
 
@@ -1036,13 +1581,13 @@ class SkroutzClientPlaywright:
                 items.append(cart_item)
 
             except Exception as e:
-                logger.warning(f"Failed to parse cart item: {e}")
+                logger.warning("Failed to parse cart item: %s", e)
                 continue
 
-        total_elem = soup.find(['span', 'div'], class_=re.compile(r'total', re.I))
-        if total_elem:
-            total_text = total_elem.get_text(strip=True)
-            total_match = re.search(r'(\d+[.,]\d+)', total_text.replace('.', '').replace(',', '.'))
+        total_elem = _first(_TOTAL_XPATH(root))
+        if total_elem is not None:
+            total_text = _element_text(total_elem)
+            total_match = _DECIMAL_RE.search(total_text.translate(_PRICE_TRANSLATE))
             if total_match:
                 total = Decimal(total_match.group(1))
 
@@ -1054,39 +1599,28 @@ class SkroutzClientPlaywright:
 
     async def _parse_orders_from_page(self) -> list[Order]:
         """Parse orders from current page."""
-        from bs4 import BeautifulSoup
-
         html = await self.page.content()
-        soup = BeautifulSoup(html, 'lxml')
+        root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
         orders = []
+        if root is None:
+            return orders
 
-        order_elements = soup.find_all(['div', 'tr'], class_=re.compile(r'order', re.I))
+        order_elements = _ORDER_ELEMENTS_XPATH(root)
+        # All orders of the page share one creation timestamp
+        created_at = datetime.now()
 
         for order_elem in order_elements:
             try:
                 order_id = ""
-                status = "unknown"
-                created_at = datetime.now()
-                total = Decimal("0")
 
-                id_elem = order_elem.find(['span', 'a'], string=re.compile(r'#?\d+', re.I))
-                if id_elem:
-                    id_match = re.search(r'(\d+)', id_elem.get_text(strip=True))
+                id_elem = _first_with_number(_ORDER_ID_CANDIDATES_XPATH(order_elem))
+                if id_elem is not None:
+                    id_match = _DIGITS_RE.search(_element_text(id_elem))
                     if id_match:
-                        order_id = id_match.group(1)
-
-                status_elem = order_elem.find(['span', 'div'], class_=re.compile(r'status', re.I))
-                if status_elem:
-                    status = status_elem.get_text(strip=True).lower()
-
-                total_elem = order_elem.find(['span', 'div'], class_=re.compile(r'total', re.I))
-                if total_elem:
-                    total_text = total_elem.get_text(strip=True)
-                    total_match = re.search(r'(\d+[.,]\d+)', total_text.replace('.', '').replace(',', '.'))
-                    if total_match:
-                        total = Decimal(total_match.group(1))
+                        order_id = id_match.group()
 
                 if order_id:
+                    status, total = _extract_status_total(order_elem)
                     order = Order(
                         id=order_id,
                         order_number=order_id,
@@ -1097,42 +1631,39 @@ class SkroutzClientPlaywright:
                     orders.append(order)
 
             except Exception as e:
-                logger.warning(f"Failed to parse order: {e}")
+                logger.warning("Failed to parse order: %s", e)
                 continue
 
         return orders
 
-    async def _parse_order_details_from_page(self, order_id: str) -> Optional[Order]:
-        """Parse order details from current page."""
-        from bs4 import BeautifulSoup
-
-        html = await self.page.content()
-        soup = BeautifulSoup(html, 'lxml')
+    async def _parse_order_details_from_page(self, order_id: str, page: Optional[Page] = None) -> Optional[Order]:
+        """Parse order details from the given page (defaults to the main page)."""
+        html = await (page or self.page).content()
+        root = etree.HTML(html.encode('utf-8'), _HTML_PARSER)
         items = []
+        if root is None:
+            return None
 
-        item_elements = soup.find_all(['div', 'tr'], class_=re.compile(r'item|product', re.I))
+        item_elements = _ORDER_ITEMS_XPATH(root)
 
         for item_elem in item_elements:
             try:
-                name_elem = item_elem.find(['a', 'span', 'td'])
-                if not name_elem:
+                name_elem, qty_elem, price_elem = _order_item_fields(item_elem)
+                if name_elem is None:
                     continue
 
-                product_name = name_elem.get_text(strip=True)
+                product_name = _element_text(name_elem)
                 quantity = 1
                 price = Decimal("0")
 
-                qty_elem = item_elem.find(['span', 'td'], string=re.compile(r'\d+', re.I))
-                if qty_elem:
-                    try:
-                        quantity = int(re.search(r'\d+', qty_elem.get_text(strip=True)).group())
-                    except:
-                        pass
+                if qty_elem is not None:
+                    parsed_quantity = _first_int(_element_text(qty_elem))
+                    if parsed_quantity is not None:
+                        quantity = parsed_quantity
 
-                price_elem = item_elem.find(['span', 'td'], class_=re.compile(r'price', re.I))
-                if price_elem:
-                    price_text = price_elem.get_text(strip=True)
-                    price_match = re.search(r'(\d+[.,]\d+)', price_text.replace('.', '').replace(',', '.'))
+                if price_elem is not None:
+                    price_text = _element_text(price_elem)
+                    price_match = _DECIMAL_RE.search(price_text.translate(_PRICE_TRANSLATE))
                     if price_match:
                         price = Decimal(price_match.group(1))
 
@@ -1145,22 +1676,10 @@ class SkroutzClientPlaywright:
                 items.append(order_item)
 
             except Exception as e:
-                logger.warning(f"Failed to parse order item: {e}")
+                logger.warning("Failed to parse order item: %s", e)
                 continue
 
-        status = "unknown"
-        total = Decimal("0")
-
-        status_elem = soup.find(['span', 'div'], class_=re.compile(r'status', re.I))
-        if status_elem:
-            status = status_elem.get_text(strip=True).lower()
-
-        total_elem = soup.find(['span', 'div'], class_=re.compile(r'total', re.I))
-        if total_elem:
-            total_text = total_elem.get_text(strip=True)
-            total_match = re.search(r'(\d+[.,]\d+)', total_text.replace('.', '').replace(',', '.'))
-            if total_match:
-                total = Decimal(total_match.group(1))
+        status, total = _extract_status_total(root)
 
         return Order(
             id=order_id,
@@ -1174,13 +1693,16 @@ class SkroutzClientPlaywright:
     async def close(self) -> None:
         """Close the browser and cleanup."""
         try:
+            if self._page_pool is not None:
+                while not self._page_pool.empty():
+                    await self._page_pool.get_nowait().close()
+                self._page_pool = None
             if self.page:
                 await self.page.close()
-            if self.context:
+            if self.context and self._owns_context:
                 await self.context.close()
-            if self.browser:
-                await self.browser.close()
-            if self.playwright:
-                await self.playwright.stop()
         except Exception as e:
             logger.warning(f"Error closing browser: {e}")
+        finally:
+            if self.browser:
+                await self._release_browser()
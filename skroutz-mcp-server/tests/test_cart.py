@@ -0,0 +1,69 @@
+"""Tests for cart page parsing in the curl_cffi client."""
+
+import pytest
+
+from skroutz_server import skroutz_client_cffi
+from skroutz_server.auth import AuthManager
+from skroutz_server.skroutz_client_cffi import SkroutzClientCffi
+
+
+@pytest.fixture
+def client(tmp_path) -> SkroutzClientCffi:
+    return SkroutzClientCffi(AuthManager(session_file=str(tmp_path / "session.json")))
+
+
+def test_react_cart_page_is_not_parsed_into_a_tree(client, monkeypatch) -> None:
+    def fail(*args, **kwargs):
+        raise AssertionError("React cart page should not be parsed")
+
+    monkeypatch.setattr(skroutz_client_cffi.etree, "HTML", fail)
+    html = (
+        "<html><body><div id='react-cart-page'>\n</div>"
+        "<script>window.cart_items_count = 3;</script></body></html>"
+    )
+
+    cart = client._parse_cart_from_html(html)
+
+    assert cart.items == []
+    assert cart.item_count == 3
+
+
+def test_rendered_react_cart_page_is_parsed(client) -> None:
+    html = (
+        '<html><body><div id="react-cart-page"><ul>'
+        '<li><a class="suborder-item-details" href="/s/1/cable.html">USB cable</a>'
+        '<p class="quantity"><strong>2</strong></p></li>'
+        "</ul></div><script>window.cart_items_count = 2;</script></body></html>"
+    )
+
+    cart = client._parse_cart_from_html(html)
+
+    assert [(item.product.name, item.quantity) for item in cart.items] == [("USB cable", 2)]
+    assert cart.item_count == 2
+
+
+def test_cart_rows_skip_recommendations_and_nested_rows(client) -> None:
+    html = (
+        '<html><body><nav><ul><li><a href="/s/5/phones.html">Phones</a></li></ul></nav>'
+        '<div class="cart"><ul>'
+        '<li><a href="/s/1/cable.html">USB cable</a><p class="quantity"><strong>2</strong></p></li>'
+        '<li class="bundle"><ul><li><a href="/s/2/pad.html">Mouse pad</a></li></ul></li>'
+        "</ul></div>"
+        '<div class="recommendations"><ul>'
+        '<li><a href="/s/9/charger.html">Fast charger</a></li>'
+        "</ul></div></body></html>"
+    )
+
+    cart = client._parse_cart_from_html(html)
+
+    assert [(item.product.name, item.quantity) for item in cart.items] == [
+        ("USB cable", 2),
+        ("Mouse pad", 1),
+    ]
+
+
+def test_cloudflare_challenge_page_is_rejected(client) -> None:
+    html = "<html><head><title>Just a moment...</title></head><body>Please wait</body></html>"
+
+    with pytest.raises(Exception, match="Cloudflare challenge detected"):
+        client._parse_cart_from_html(html)
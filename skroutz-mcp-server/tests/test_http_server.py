@@ -0,0 +1,64 @@
+"""Tests for the HTTP server's client pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from skroutz_server import http_server  # noqa: E402
+from skroutz_server.auth import AuthManager  # noqa: E402
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_server, "_POOL_SIZE", 3)
+    http_server._init_client_pool(AuthManager(session_file=str(tmp_path / "session.json")))
+    yield http_server.skroutz_clients
+    for client in http_server.skroutz_clients:
+        client.close()
+
+
+def test_cookies_set_by_a_read_reach_every_client(pool) -> None:
+    def refresh_clearance(client) -> None:
+        client.session.cookies.set("cf_clearance", "fresh", domain=".skroutz.gr")
+
+    async def run() -> None:
+        await http_server._run_client(refresh_clearance)
+
+    asyncio.run(run())
+
+    assert [client.session.cookies.get("cf_clearance") for client in pool] == ["fresh"] * 3
+
+
+def test_exclusive_call_waits_for_reads_and_holds_every_client(pool) -> None:
+    read_started = threading.Event()
+    release_read = threading.Event()
+    checked_out_during_write = []
+
+    def slow_read(client) -> None:
+        read_started.set()
+        release_read.wait(5)
+
+    def logout(client) -> None:
+        checked_out_during_write.append(http_server.client_pool.qsize())
+        client.session.cookies.clear()
+
+    async def run() -> None:
+        for client in pool:
+            client.session.cookies.set("session", "stale", domain=".skroutz.gr")
+        read = asyncio.create_task(http_server._run_client(slow_read))
+        await asyncio.to_thread(read_started.wait, 5)
+        write = asyncio.create_task(http_server._run_client_exclusive(logout))
+        await asyncio.sleep(0.05)
+        # The write needs the client the read still holds
+        assert not checked_out_during_write
+        release_read.set()
+        await asyncio.gather(read, write)
+
+    asyncio.run(run())
+
+    assert checked_out_during_write == [0]
+    assert http_server.client_pool.qsize() == 3
+    assert [client.session.cookies.get("session") for client in pool] == [None] * 3
@@ -0,0 +1,36 @@
+"""Tests for order list parsing in the curl_cffi client."""
+
+from decimal import Decimal
+
+from skroutz_server.auth import AuthManager
+from skroutz_server.skroutz_client_cffi import SkroutzClientCffi, _build_order
+
+
+def test_nested_orders_keep_document_order(tmp_path) -> None:
+    client = SkroutzClientCffi(AuthManager(session_file=str(tmp_path / "session.json")))
+    html = (
+        b'<html><body><div class="orders">'
+        b'<div class="order"><span class="order-code">250101-1</span>'
+        b'<div class="order"><span class="order-code">250102-2</span><span>15,00 \xe2\x82\xac</span></div>'
+        b'</div>'
+        b'<div class="order"><span class="order-code">250103-3</span><span>4,50 \xe2\x82\xac</span></div>'
+        b'</div></body></html>'
+    )
+    # Feed the body in small chunks, as it would arrive over the network
+    chunks = [html[i:i + 16] for i in range(0, len(html), 16)]
+
+    orders = client._parse_orders_from_stream(chunks)
+
+    assert [order.id for order in orders] == ["1", "2", "3"]
+    # The outer order still sees the amounts of the order nested in it
+    assert [order.total for order in orders] == [Decimal("15.00"), Decimal("15.00"), Decimal("4.50")]
+
+
+def test_json_order_fields_of_an_unexpected_type_use_defaults() -> None:
+    order = _build_order(
+        {"id": 7, "code": "250101-7", "status": None, "created_at": 1735689600, "total": "12.50"}
+    )
+
+    assert order is not None
+    assert order.status == "unknown"
+    assert order.total == Decimal("12.50")
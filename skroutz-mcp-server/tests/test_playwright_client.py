@@ -0,0 +1,122 @@
+"""Tests for the Playwright client."""
+
+import asyncio
+
+import pytest
+
+pytest.importorskip("playwright")
+
+from skroutz_server.auth import AuthManager  # noqa: E402
+from playwright.async_api import Error as PlaywrightError  # noqa: E402
+
+from skroutz_server import skroutz_client_playwright  # noqa: E402
+from skroutz_server.skroutz_client_playwright import SkroutzClientPlaywright  # noqa: E402
+
+
+class FakeContext:
+    def __init__(self) -> None:
+        self.pages = 0
+
+    async def add_cookies(self, cookies) -> None:
+        await asyncio.sleep(0)
+
+    async def add_init_script(self, script) -> None:
+        await asyncio.sleep(0)
+
+    async def new_page(self) -> object:
+        await asyncio.sleep(0)
+        self.pages += 1
+        return object()
+
+
+class FakeBrowser:
+    contexts: list = []
+
+    def __init__(self) -> None:
+        self.new_contexts: list[FakeContext] = []
+
+    async def new_context(self, **kwargs) -> FakeContext:
+        await asyncio.sleep(0)
+        context = FakeContext()
+        self.new_contexts.append(context)
+        return context
+
+
+def test_concurrent_first_use_creates_one_context_and_pool(tmp_path, monkeypatch) -> None:
+    client = SkroutzClientPlaywright(
+        AuthManager(session_file=str(tmp_path / "session.json")),
+        storage_state_path=str(tmp_path / "state.json"),
+    )
+    browser = FakeBrowser()
+    acquired = []
+
+    async def acquire_browser() -> tuple[object, FakeBrowser]:
+        await asyncio.sleep(0)
+        acquired.append(browser)
+        return object(), browser
+
+    monkeypatch.setattr(client, "_acquire_browser", acquire_browser)
+
+    async def first_use() -> None:
+        await asyncio.gather(*(client.init_page_pool(size=2) for _ in range(3)))
+
+    asyncio.run(first_use())
+
+    assert len(acquired) == 1
+    assert len(browser.new_contexts) == 1
+    # The main page plus one pool of two pages
+    assert browser.new_contexts[0].pages == 3
+    assert client._page_pool.qsize() == 2
+
+
+def test_launch_falls_back_to_the_default_channel(tmp_path) -> None:
+    client = SkroutzClientPlaywright(AuthManager(session_file=str(tmp_path / "session.json")))
+    launches = []
+    browser = object()
+
+    class FakeChromium:
+        async def launch(self, **options) -> object:
+            launches.append(options.get("channel"))
+            if "channel" in options:
+                raise PlaywrightError("Unsupported chromium channel")
+            return browser
+
+    class FakePlaywright:
+        chromium = FakeChromium()
+
+    assert asyncio.run(client._launch_browser(FakePlaywright())) is browser
+    assert launches == ["chromium", None]
+
+
+def test_shared_browser_is_not_reused_across_event_loops(tmp_path, monkeypatch) -> None:
+    drivers = []
+
+    class FakeDriver:
+        async def start(self) -> "FakeDriver":
+            drivers.append(self)
+            return self
+
+    class FakeSharedBrowser:
+        def is_connected(self) -> bool:
+            return True
+
+    async def launch_browser(playwright) -> FakeSharedBrowser:
+        return FakeSharedBrowser()
+
+    monkeypatch.setattr(skroutz_client_playwright, "async_playwright", FakeDriver)
+    clients = [
+        SkroutzClientPlaywright(
+            AuthManager(session_file=str(tmp_path / "session.json")), cdp_endpoint="http://cdp"
+        )
+        for _ in range(2)
+    ]
+    for client in clients:
+        monkeypatch.setattr(client, "_launch_browser", launch_browser)
+
+    first = asyncio.run(clients[0]._acquire_browser())
+    # A later asyncio.run gets its own driver and browser instead of the dead loop's
+    second = asyncio.run(clients[1]._acquire_browser())
+
+    assert len(drivers) == 2
+    assert second[0] is not first[0] and second[1] is not first[1]
+    assert SkroutzClientPlaywright._shared_refcounts == {("http://cdp", True): 1}
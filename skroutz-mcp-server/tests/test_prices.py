@@ -0,0 +1,40 @@
+"""Tests for euro amount parsing in the curl_cffi client."""
+
+from decimal import Decimal
+
+import pytest
+
+from skroutz_server.auth import AuthManager
+from skroutz_server.skroutz_client_cffi import SkroutzClientCffi, _euro_to_cents
+
+
+@pytest.mark.parametrize(
+    ("amount", "cents"),
+    [
+        ("1.136,25", 113625),
+        ("12,5", 1250),
+        ("12,", 1200),
+        ("7", 700),
+        (",99", 99),
+        (",5", 50),
+    ],
+)
+def test_euro_to_cents(amount: str, cents: int) -> None:
+    assert _euro_to_cents(amount) == cents
+
+
+@pytest.mark.parametrize("amount", ["", ",", ".", "1,2,3", "1,234", "a,99", ",9x"])
+def test_euro_to_cents_rejects_invalid_amounts(amount: str) -> None:
+    assert _euro_to_cents(amount) is None
+
+
+def test_search_result_price_without_integer_part(tmp_path) -> None:
+    client = SkroutzClientCffi(AuthManager(session_file=str(tmp_path / "session.json")))
+    html = (
+        '<html><body><ul><li data-skuid="1"><a href="/s/1/cable.html" title="Cable">Cable</a>'
+        '<span class="price">,99 €</span></li></ul></body></html>'
+    )
+
+    products = client._parse_products_from_html(html)
+
+    assert [product.price for product in products] == [Decimal("0.99")]